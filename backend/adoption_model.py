@@ -0,0 +1,337 @@
+import asyncio
+import csv
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+# numpy/scipy/joblib/sklearn are imported where they're used, so importing
+# this module (as the API does at startup) stays cheap
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+MODEL_DIR = os.getenv("MODEL_DIR", os.path.join(BASE_DIR, "models"))
+LATEST_POINTER = "LATEST"
+
+# How often (seconds) the API checks for a newer model version
+RELOAD_CHECK_SECONDS = int(os.getenv("MODEL_RELOAD_CHECK_SECONDS", 30))
+MIN_TRAINING_ROWS = 50
+
+# RescueGroups animalGeneralAge → approximate age in months
+GENERAL_AGE_MONTHS = {"baby": 3, "young": 12, "adult": 48, "senior": 120}
+
+
+class ModelUnavailable(Exception):
+    pass
+
+
+# -------------------- Features -------------------- #
+
+def load_vocabulary(path, column):
+    """Lower-cased label → index, in file order (index 0 is reserved for unknown)."""
+    vocab = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            name = (row.get(column) or "").strip().lower()
+            if name and name not in vocab:
+                vocab[name] = len(vocab) + 1
+    return vocab
+
+
+def load_vocabularies():
+    return (
+        load_vocabulary(os.path.join(DATA_DIR, "BreedLabels.csv"), "BreedName"),
+        load_vocabulary(os.path.join(DATA_DIR, "ColorLabels.csv"), "ColorName"),
+    )
+
+
+class FeatureEncoder:
+    """Sparse one-hot breed/color plus age and health columns.
+
+    Layout: [breed one-hot | color one-hot | age_years | age_missing | unhealthy]
+    """
+
+    def __init__(self, breeds, colors):
+        self.breeds = breeds
+        self.colors = colors
+        self.color_offset = len(breeds) + 1
+        self.numeric_offset = self.color_offset + len(colors) + 1
+        self.n_features = self.numeric_offset + 3
+
+    def _lookup(self, vocab, values):
+        import numpy as np
+
+        return np.fromiter(
+            (vocab.get(str(v).strip().lower(), 0) if v is not None else 0 for v in values),
+            dtype=np.int64, count=len(values),
+        )
+
+    def encode(self, breeds, colors, ages_months, health):
+        """Encode parallel sequences into one CSR matrix (one row per cat)."""
+        import numpy as np
+        from scipy import sparse
+
+        n = len(breeds)
+        breed_idx = self._lookup(self.breeds, breeds)
+        color_idx = self._lookup(self.colors, colors) + self.color_offset
+
+        ages = np.array([np.nan if a is None else a for a in ages_months], dtype=float)
+        age_missing = np.isnan(ages)
+        age_years = np.clip(np.nan_to_num(ages, nan=0.0) / 12.0, 0, 25)
+        unhealthy = np.nan_to_num(np.array([np.nan if h is None else h for h in health], dtype=float)) > 0
+
+        rows = np.repeat(np.arange(n), 5)
+        cols = np.column_stack([
+            breed_idx, color_idx,
+            np.full(n, self.numeric_offset),
+            np.full(n, self.numeric_offset + 1),
+            np.full(n, self.numeric_offset + 2),
+        ]).ravel()
+        data = np.column_stack([
+            np.ones(n), np.ones(n), age_years, age_missing.astype(float), unhealthy.astype(float),
+        ]).ravel()
+        return sparse.csr_matrix((data, (rows, cols)), shape=(n, self.n_features))
+
+    def encode_records(self, cats):
+        """Encode API-style dicts: breed, color, age_months (or a RescueGroups
+        general 'age' such as 'Young'), health."""
+        return self.encode(
+            [c.get("breed") for c in cats],
+            [c.get("color") for c in cats],
+            [_age_months(c) for c in cats],
+            [_to_float(c.get("health")) for c in cats],
+        )
+
+    def encode_frame(self, df):
+        """Encode the combined adoption dataset (Breed, Color, Age, Health)."""
+        def column(name):
+            if name not in df.columns:
+                return [None] * len(df)
+            return [None if v is None or v != v else v for v in df[name].astype(object)]
+        return self.encode(column("Breed"), column("Color"), column("Age"), column("Health"))
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _age_months(cat):
+    months = _to_float(cat.get("age_months"))
+    if months is None and isinstance(cat.get("age"), str):
+        months = GENERAL_AGE_MONTHS.get(cat["age"].strip().lower())
+    return months
+
+
+# -------------------- Training -------------------- #
+
+def train_adoption_model(df, model_dir=MODEL_DIR):
+    """Fit the adoption-likelihood classifier (and, where AdoptionSpeed labels
+    exist, a 0–4 adoption-speed classifier) on the combined dataset and write a
+    versioned artifact. Returns the artifact path, or None if skipped."""
+    import joblib
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import roc_auc_score
+    from sklearn.model_selection import train_test_split
+
+    labelled = df[df["Adoption_Status"].notna()] if "Adoption_Status" in df.columns else df.iloc[0:0]
+    y = labelled["Adoption_Status"].astype(int).to_numpy() if len(labelled) else np.array([])
+    if len(labelled) < MIN_TRAINING_ROWS or len(np.unique(y)) < 2:
+        print(f"Not enough labelled rows to train the adoption model ({len(labelled)}); skipping.")
+        return None
+
+    breeds, colors = load_vocabularies()
+    encoder = FeatureEncoder(breeds, colors)
+    X = encoder.encode_frame(labelled)
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    model = LogisticRegression(max_iter=1000)
+    model.fit(X_train, y_train)
+    auc = roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])
+
+    # Refit on everything for the shipped model
+    model.fit(X, y)
+    speed_model = train_speed_model(df, encoder)
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    artifact = {
+        "version": version,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "rows": int(len(labelled)),
+        "metrics": {"holdout_auc": round(float(auc), 4)},
+        "breeds": breeds,
+        "colors": colors,
+        "likelihood_model": model,
+        "speed_model": speed_model,
+    }
+    os.makedirs(model_dir, exist_ok=True)
+    filename = f"adoption_model-{version}.joblib"
+    joblib.dump(artifact, os.path.join(model_dir, filename))
+
+    # Flip the pointer last so the API only ever sees complete artifacts
+    pointer = os.path.join(model_dir, LATEST_POINTER)
+    with open(pointer + ".tmp", "w") as f:
+        f.write(filename)
+    os.replace(pointer + ".tmp", pointer)
+    print(f"Adoption model {version} trained on {len(labelled)} rows (holdout AUC {auc:.3f})")
+    return os.path.join(model_dir, filename)
+
+
+def train_speed_model(df, encoder):
+    """Multiclass AdoptionSpeed (0–4) classifier, or None without enough labels."""
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+
+    if "AdoptionSpeed" not in df.columns:
+        return None
+    labelled = df[df["AdoptionSpeed"].notna()]
+    y = labelled["AdoptionSpeed"].astype(int).to_numpy()
+    if len(labelled) < MIN_TRAINING_ROWS or len(np.unique(y)) < 2:
+        print(f"Not enough AdoptionSpeed labels to train the speed model ({len(labelled)}); skipping.")
+        return None
+
+    model = LogisticRegression(max_iter=1000)
+    model.fit(encoder.encode_frame(labelled), y)
+    print(f"AdoptionSpeed model trained on {len(labelled)} rows")
+    return model
+
+
+# -------------------- Serving -------------------- #
+
+class ModelService:
+    """Holds the current model in memory and hot-swaps to a newer version when
+    the LATEST pointer in model_dir changes (checked at most every
+    RELOAD_CHECK_SECONDS)."""
+
+    def __init__(self, model_dir=MODEL_DIR):
+        self.model_dir = model_dir
+        self._current = None   # (filename, artifact, encoder)
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def _pointer(self):
+        try:
+            with open(os.path.join(self.model_dir, LATEST_POINTER)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def load(self):
+        """Load the version LATEST points at, if it isn't loaded already."""
+        self._checked_at = time.monotonic()
+        filename = self._pointer()
+        if filename is None or (self._current and self._current[0] == filename):
+            return False
+        with self._lock:
+            if self._current and self._current[0] == filename:
+                return False
+            import joblib
+
+            artifact = joblib.load(os.path.join(self.model_dir, filename))
+            encoder = FeatureEncoder(artifact["breeds"], artifact["colors"])
+            # Single assignment: in-flight predictions keep the version they started with
+            self._current = (filename, artifact, encoder)
+        print(f"🧠 Loaded adoption model {artifact['version']}")
+        return True
+
+    def maybe_reload(self):
+        if time.monotonic() - self._checked_at >= RELOAD_CHECK_SECONDS:
+            try:
+                self.load()
+            except Exception as e:
+                print(f"⚠️ Model reload failed, keeping current version: {e}")
+
+    def current(self):
+        self.maybe_reload()
+        if self._current is None:
+            raise ModelUnavailable("No adoption model has been trained yet")
+        return self._current
+
+    @property
+    def version(self):
+        return self._current[1]["version"] if self._current else None
+
+    def predict_likelihood(self, cats):
+        """Adoption probability for each cat dict, scored in one batch."""
+        if not cats:
+            return []
+        _, artifact, encoder = self.current()
+        X = encoder.encode_records(cats)
+        return artifact["likelihood_model"].predict_proba(X)[:, 1].tolist()
+
+    def predict_speed(self, cats):
+        """Most likely AdoptionSpeed bucket (0–4) for each cat, in one batch."""
+        if not cats:
+            return []
+        _, artifact, encoder = self.current()
+        model = artifact.get("speed_model")
+        if model is None:
+            raise ModelUnavailable("The current model has no AdoptionSpeed predictor")
+        return [int(v) for v in model.predict(encoder.encode_records(cats))]
+
+
+class AdoptionSpeedStage:
+    """Adds predicted_adoption_speed to a page of search results.
+
+    The whole page is scored as one matrix. Scores are memoized per
+    (model version, animalID, animalUpdatedDate), so a cat is only re-scored
+    when its record or the model changes. If scoring takes longer than
+    budget_ms the page is returned without the missing scores; the batch
+    still finishes in the background and fills the memo for next time.
+    """
+
+    def __init__(self, service, budget_ms=50, max_entries=50000):
+        self.service = service
+        self.budget = budget_ms / 1000
+        self.max_entries = max_entries
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"memo_hits": 0, "scored": 0, "over_budget": 0, "unavailable": 0}
+
+    def _key(self, cat):
+        return (self.service.version, cat.get("id"), cat.get("animalUpdatedDate"))
+
+    def _score(self, cats):
+        buckets = self.service.predict_speed(cats)
+        with self._lock:
+            for cat, bucket in zip(cats, buckets):
+                self._memo[self._key(cat)] = bucket
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+            self.counters["scored"] += len(cats)
+
+    def _apply_memo(self, cats):
+        pending = []
+        with self._lock:
+            for cat in cats:
+                key = self._key(cat)
+                if key in self._memo:
+                    self._memo.move_to_end(key)
+                    cat["predicted_adoption_speed"] = self._memo[key]
+                else:
+                    pending.append(cat)
+        return pending
+
+    async def __call__(self, cats):
+        pending = self._apply_memo(cats)
+        self.counters["memo_hits"] += len(cats) - len(pending)
+        if not pending:
+            return cats
+
+        try:
+            # shield: on timeout the batch keeps running and populates the memo
+            await asyncio.wait_for(asyncio.shield(asyncio.to_thread(self._score, pending)), self.budget)
+        except asyncio.TimeoutError:
+            self.counters["over_budget"] += 1
+        except ModelUnavailable:
+            self.counters["unavailable"] += 1
+            return cats
+        except Exception as e:
+            print(f"⚠️ Adoption speed scoring failed; returning cats unscored: {e}")
+            return cats
+        self._apply_memo(pending)
+        return cats
@@ -0,0 +1,55 @@
+"""Latency benchmark for the shelter radius index.
+
+    python bench/bench_geo.py [--shelters 5000] [--radius 25] [--queries 2000]
+
+Scatters synthetic shelters over the continental US and times
+GridIndex.within() against a linear haversine scan over every shelter.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geo import GridIndex, haversine_miles  # noqa: E402
+
+def random_point(rng):
+    return rng.uniform(25.0, 49.0), rng.uniform(-124.0, -67.0)
+
+def linear_scan(points, lat, lon, radius):
+    hits = [(key, haversine_miles(lat, lon, plat, plon)) for key, plat, plon in points]
+    return sorted((h for h in hits if h[1] <= radius), key=lambda h: h[1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shelters", type=int, default=5000)
+    parser.add_argument("--radius", type=float, default=25)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    points = [(str(i), *random_point(rng)) for i in range(args.shelters)]
+    queries = [random_point(rng) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = GridIndex(points)
+    print(f"build: {(time.perf_counter() - start) * 1000:.1f} ms for {index.size} shelters")
+
+    for name, fn in [("grid", lambda q: index.within(*q, args.radius)),
+                     ("linear", lambda q: linear_scan(points, *q, args.radius))]:
+        timings = []
+        for q in queries:
+            start = time.perf_counter()
+            fn(q)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        p50 = timings[len(timings) // 2] * 1000
+        p99 = timings[int(len(timings) * 0.99)] * 1000
+        print(f"{name:>6}: p50 {p50:.3f} ms  p99 {p99:.3f} ms")
+
+    mismatches = sum(index.within(*q, args.radius) != linear_scan(points, *q, args.radius) for q in queries[:200])
+    print(f"mismatches vs linear scan: {mismatches}")
+
+if __name__ == "__main__":
+    main()
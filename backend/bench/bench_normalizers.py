@@ -0,0 +1,98 @@
+"""Micro-benchmark: row-wise .apply() normalizers vs the vectorized ones.
+
+    python bench/bench_normalizers.py [--rows 1000000] [--repeat 3]
+
+Prints rows/sec for the old per-row implementation (kept below for
+reference only) and the vectorized implementation in normalizers.py, and
+checks that both produce the same values.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import normalizers  # noqa: E402
+
+# -------------------- Legacy row-wise versions -------------------- #
+
+def legacy_health_from_code(value):
+    if pd.isna(value):
+        return 0
+    try:
+        v = int(value)
+    except:
+        return 0
+    return 1 if v in (2, 3) else 0
+
+def legacy_health_from_text(value):
+    if pd.isna(value):
+        return 0
+    v = str(value).lower()
+    return 1 if any(t in v for t in ['injur', 'sick', 'ill', 'medical']) else 0
+
+def legacy_days_to_speed(days):
+    if pd.isna(days):
+        return 4
+    if days <= 0:  return 0
+    if days <= 7:  return 1
+    if days <= 30: return 2
+    if days <= 90: return 3
+    return 4
+
+def legacy_speed_to_status(speed):
+    if pd.isna(speed):
+        return 0
+    return 1 if speed in [0, 1, 2, 3] else 0
+
+# -------------------- Synthetic columns -------------------- #
+
+def make_columns(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    days = rng.integers(-5, 400, rows).astype(float)
+    days[rng.random(rows) < 0.1] = np.nan
+    codes = rng.choice([1.0, 2.0, 3.0, np.nan], rows)
+    conditions = rng.choice(['Normal', 'Injured', 'Sick', 'Nursing', 'Medical', 'Feral', None], rows)
+    return {
+        "days": pd.Series(days),
+        "speed": pd.Series(rng.choice([0, 1, 2, 3, 4, np.nan], rows)),
+        "codes": pd.Series(codes),
+        "conditions": pd.Series(conditions, dtype=object),
+    }
+
+CASES = [
+    ("convert_days_to_speed", "days", legacy_days_to_speed, normalizers.convert_days_to_speed),
+    ("map_speed_to_status", "speed", legacy_speed_to_status, normalizers.map_speed_to_status),
+    ("normalize_health_from_code", "codes", legacy_health_from_code, normalizers.normalize_health_from_code),
+    ("normalize_health_from_text", "conditions", legacy_health_from_text, normalizers.normalize_health_from_text),
+]
+
+def best_of(fn, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    columns = make_columns(args.rows)
+    print(f"{'normalizer':<28} {'apply rows/s':>14} {'vectorized rows/s':>18} {'speedup':>8}")
+    for name, column, legacy, vectorized in CASES:
+        series = columns[column]
+        t_old, old = best_of(lambda: series.apply(legacy), args.repeat)
+        t_new, new = best_of(lambda: vectorized(series), args.repeat)
+        if not np.array_equal(old.to_numpy(dtype='int64'), new.to_numpy(dtype='int64')):
+            print(f"!! {name}: vectorized output differs from the row-wise version")
+        print(f"{name:<28} {args.rows / t_old:>14,.0f} {args.rows / t_new:>18,.0f} {t_old / t_new:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Offline benchmark of load_kaggle.refresh_all_data() on synthetic sources.
+
+    python bench/bench_refresh.py [--rows 10k|1m|10m] [--workdir /tmp/purrmatch-bench]
+                                  [--workers 1] [--train] [--warm] [--json out.json]
+
+Generates (once per size) synthetic archives with bench/synth_kaggle.py,
+serves them through a fake Kaggle client, runs a cold refresh in a scratch
+directory and reports wall time, CPU time and peak RSS per stage (download,
+parse, transform, concat, write, insights, train). --warm runs a second
+refresh, which should skip every unchanged source.
+
+Stages are attributed per thread, so keep --workers 1 (the default) for
+per-stage CPU and memory figures; CPU time is process-wide and includes
+pyarrow's native threads.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+from synth_kaggle import SOURCES, FakeKaggleApi, generate, parse_rows  # noqa: E402
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / 1e6
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StageRecorder:
+    """STAGE_HOOKS callable that totals time per (stage, source) and samples
+    RSS in the background, charging each sample to the innermost open stage."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.totals = defaultdict(lambda: {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_rss_mb": 0.0})
+        self.peak_rss_mb = 0.0
+        self._open = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+
+    def _sample(self):
+        rss = current_rss_mb()
+        with self._lock:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+            if self._open:
+                entry = self.totals[self._open[-1]]
+                entry["peak_rss_mb"] = max(entry["peak_rss_mb"], rss)
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __call__(self, event):
+        key = (event["stage"], event["source"] or "-")
+        if event["event"] == "start":
+            with self._lock:
+                self._open.append(key)
+            self._sample()
+            return
+        self._sample()
+        with self._lock:
+            if key in self._open:
+                self._open.reverse()
+                self._open.remove(key)
+                self._open.reverse()
+            entry = self.totals[key]
+            entry["calls"] += 1
+            entry["wall_s"] += event["wall_s"]
+            entry["cpu_s"] += event["cpu_s"]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def prepare_run_dir(run_dir, archive_dir):
+    """Scratch working directory laid out the way load_kaggle expects."""
+    shutil.rmtree(run_dir, ignore_errors=True)
+    os.makedirs(os.path.join(run_dir, "data"))
+    for name in ("BreedLabels.csv", "ColorLabels.csv"):
+        shutil.copyfile(os.path.join(BACKEND_DIR, "data", name), os.path.join(run_dir, "data", name))
+    shutil.copyfile(os.path.join(archive_dir, "train.csv"), os.path.join(run_dir, "data", "train.csv"))
+
+
+def run_refresh(load_kaggle, train):
+    recorder = StageRecorder()
+    load_kaggle.STAGE_HOOKS[:] = [recorder]
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    with recorder:
+        load_kaggle.refresh_all_data(train_model=train)
+    return {
+        "wall_s": round(time.perf_counter() - wall_started, 3),
+        "cpu_s": round(time.process_time() - cpu_started, 3),
+        "peak_rss_mb": round(recorder.peak_rss_mb, 1),
+        "stages": [
+            {"stage": stage, "source": source, **{k: round(v, 3) if isinstance(v, float) else v
+                                                  for k, v in entry.items()}}
+            for (stage, source), entry in recorder.totals.items()
+        ],
+    }
+
+
+def print_report(label, result, by_source):
+    print(f"\n== {label}: wall {result['wall_s']}s, cpu {result['cpu_s']}s, peak RSS {result['peak_rss_mb']} MB")
+    rows = defaultdict(lambda: {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_rss_mb": 0.0})
+    for s in result["stages"]:
+        key = (s["stage"], s["source"]) if by_source else (s["stage"], "")
+        rows[key]["calls"] += s["calls"]
+        rows[key]["wall_s"] += s["wall_s"]
+        rows[key]["cpu_s"] += s["cpu_s"]
+        rows[key]["peak_rss_mb"] = max(rows[key]["peak_rss_mb"], s["peak_rss_mb"])
+    print(f"{'stage':<12}{'source':<12}{'calls':>6}{'wall s':>10}{'cpu s':>10}{'peak MB':>10}")
+    for (stage, source), r in sorted(rows.items(), key=lambda kv: -kv[1]["wall_s"]):
+        print(f"{stage:<12}{source:<12}{r['calls']:>6}{r['wall_s']:>10.3f}{r['cpu_s']:>10.3f}{r['peak_rss_mb']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10k", help="rows per source, e.g. 10k, 1m, 10m")
+    parser.add_argument("--workdir", default="/tmp/purrmatch-bench")
+    parser.add_argument("--workers", type=int, default=1, help="INGEST_WORKERS for the run")
+    parser.add_argument("--train", action="store_true", help="include adoption model training")
+    parser.add_argument("--warm", action="store_true", help="also time a second, no-change refresh")
+    parser.add_argument("--by-source", action="store_true", help="break stages down per source")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+    archive_dir = os.path.join(args.workdir, f"archives-{rows}")
+    if not all(os.path.exists(os.path.join(archive_dir, archive)) for _, _, archive, _, _ in SOURCES):
+        generate(archive_dir, rows)
+
+    run_dir = os.path.join(args.workdir, "run")
+    prepare_run_dir(run_dir, archive_dir)
+    # Keep every output inside the scratch directory
+    os.environ["INSIGHTS_PATH"] = os.path.join(run_dir, "insights.json")
+    os.environ["MODEL_DIR"] = os.path.join(run_dir, "models")
+    os.environ["INGEST_WORKERS"] = str(args.workers)
+    os.chdir(run_dir)
+
+    import load_kaggle
+    load_kaggle.set_kaggle_api(FakeKaggleApi(archive_dir))
+
+    results = {"rows_per_source": rows, "workers": args.workers, "cold": run_refresh(load_kaggle, args.train)}
+    if args.warm:
+        results["warm"] = run_refresh(load_kaggle, args.train)
+
+    for label in ("cold", "warm"):
+        if label in results:
+            print_report(f"{label} refresh, {rows} rows/source", results[label], args.by_source)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
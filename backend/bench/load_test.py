@@ -0,0 +1,125 @@
+"""Fixed-concurrency load test for /api/search_cats and /api/cat/<id>.
+
+    python bench/mock_rescue.py &
+    RESCUE_API_URL=http://localhost:5055/http/v2.json INVENTORY_SYNC_INTERVAL=0 python main.py &
+    python bench/load_test.py [--concurrency 16] [--duration 30] [--mix 0.5] [--json out.json]
+
+Each worker loops for --duration seconds, picking a search page (random
+city/state and page 1–3) or, with probability --mix, the detail page of a cat
+seen in earlier results. Reports throughput, p50/p95/p99 per route and,
+by diffing the mock's /_mock/stats, upstream calls per request.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+LOCATIONS = [
+    ("Portland", "OR"), ("Seattle", "WA"), ("Austin", "TX"), ("Denver", "CO"),
+    ("Boston", "MA"), ("Chicago", "IL"), ("", "GA"), ("", "AZ"), ("Miami", "FL"),
+]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def mock_calls(client, mock_url):
+    try:
+        return (await client.get(f"{mock_url}/_mock/stats")).json().get("calls", 0)
+    except (httpx.HTTPError, ValueError):
+        return None
+
+
+async def worker(client, args, deadline, rng, seen_ids, latencies, errors):
+    while time.perf_counter() < deadline:
+        if seen_ids and rng.random() < args.mix:
+            route, url = "/api/cat/{id}", f"{args.base_url}/api/cat/{rng.choice(seen_ids)}"
+            params = None
+        else:
+            city, state = rng.choice(LOCATIONS)
+            route, url = "/api/search_cats", f"{args.base_url}/api/search_cats"
+            params = {"city": city, "state": state, "limit": 9, "page": rng.randint(1, 3)}
+
+        start = time.perf_counter()
+        try:
+            res = await client.get(url, params=params)
+            elapsed = time.perf_counter() - start
+            if res.status_code >= 400:
+                errors[route] += 1
+                continue
+            if route == "/api/search_cats":
+                seen_ids.extend(str(c["id"]) for c in res.json().get("cats", []) if c.get("id"))
+                del seen_ids[:-5000]
+        except httpx.HTTPError:
+            errors[route] += 1
+            continue
+        latencies[route].append(elapsed)
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        calls_before = await mock_calls(client, args.mock_url)
+        latencies, errors, seen_ids = defaultdict(list), defaultdict(int), []
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*[
+            worker(client, args, deadline, random.Random(args.seed + i), seen_ids, latencies, errors)
+            for i in range(args.concurrency)
+        ])
+        wall = time.perf_counter() - start
+        calls_after = await mock_calls(client, args.mock_url)
+
+    total = sum(len(v) for v in latencies.values()) + sum(errors.values())
+    report = {"concurrency": args.concurrency, "seconds": round(wall, 2), "requests": total,
+              "throughput_rps": round(total / wall, 1), "routes": {}}
+    for route in sorted(set(latencies) | set(errors)):
+        values = sorted(latencies[route])
+        report["routes"][route] = {
+            "ok": len(values), "errors": errors[route],
+            **{f"p{int(q * 100)}_ms": round(percentile(values, q) * 1000, 1) for q in (0.5, 0.95, 0.99)},
+        }
+    if calls_before is not None and calls_after is not None and total:
+        report["upstream_calls"] = calls_after - calls_before
+        report["upstream_calls_per_request"] = round((calls_after - calls_before) / total, 3)
+    return report
+
+
+def print_report(report):
+    print(f"\n{report['requests']} requests in {report['seconds']}s at concurrency "
+          f"{report['concurrency']}: {report['throughput_rps']} req/s")
+    print(f"{'route':<20}{'ok':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, r in report["routes"].items():
+        print(f"{route:<20}{r['ok']:>8}{r['errors']:>8}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}")
+    if "upstream_calls_per_request" in report:
+        print(f"upstream calls: {report['upstream_calls']} ({report['upstream_calls_per_request']} per request)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:5050")
+    parser.add_argument("--mock-url", default="http://localhost:5055")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--mix", type=float, default=0.5, help="fraction of requests that are detail pages")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Local stand-in for the RescueGroups HTTP API, for benchmarks and load tests.
+
+    python bench/mock_rescue.py [--port 5055] [--latency-ms 150] [--jitter-ms 50]
+                                [--error-rate 0.01] [--timeout-rate 0]
+                                [--recordings bench/recordings] [--record-from URL]
+                                [--animals 5000] [--orgs 200]
+
+Point the API at it with RESCUE_API_URL=http://localhost:5055/http/v2.json.
+
+publicSearch requests for animals and orgs are answered from recordings
+(JSON files of {"request": payload, "response": body}) when one matches the
+query, otherwise from a seeded synthetic dataset whose fields and allowed
+values follow fields.json. With --record-from, misses are forwarded to a real
+endpoint once and saved as new recordings. GET /_mock/stats reports how many
+calls were served, for upstream-calls-per-request figures.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache import search_key  # noqa: E402
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIELDS_PATH = os.path.join(BACKEND_DIR, "fields.json")
+
+CITIES = [
+    ("Portland", "OR", "97201"), ("Seattle", "WA", "98101"), ("Austin", "TX", "73301"),
+    ("Denver", "CO", "80202"), ("Boston", "MA", "02108"), ("Chicago", "IL", "60601"),
+    ("Atlanta", "GA", "30303"), ("Phoenix", "AZ", "85001"), ("Miami", "FL", "33101"),
+    ("Minneapolis", "MN", "55401"), ("Bloomington", "IN", "47401"), ("San Diego", "CA", "92101"),
+]
+STATUSES = ["Available"] * 8 + ["Adopted", "Hold"]
+
+
+def load_schema(path=FIELDS_PATH):
+    """publicSearch field definitions from an objectAction=define response."""
+    with open(path) as f:
+        return json.load(f)["data"]["publicSearch"]["fields"]
+
+
+def read_labels(filename, column, type_filter=None):
+    with open(os.path.join(BACKEND_DIR, "data", filename), newline="") as f:
+        return [r[column] for r in csv.DictReader(f) if type_filter is None or r.get("Type") == type_filter]
+
+
+# -------------------- Synthetic data -------------------- #
+
+def fake_value(name, spec, rng, animal_id):
+    values = spec.get("values")
+    if isinstance(values, list) and any(values):
+        return rng.choice([v for v in values if v])
+    kind = spec.get("type")
+    if kind == "date":
+        return (datetime(2024, 1, 1) + timedelta(minutes=rng.randrange(0, 600 * 24 * 60))).strftime("%m/%d/%Y %I:%M %p")
+    if kind in ("decimal", "int"):
+        return str(rng.randint(0, 100))
+    if kind == "postalcode":
+        return f"{rng.randrange(10000, 99999)}"
+    if kind == "url":
+        return f"https://example.org/animals/{animal_id}"
+    return f"{spec.get('friendlyname', name)} {rng.randrange(1000)}"
+
+
+def build_orgs(count, rng):
+    orgs = {}
+    for i in range(1, count + 1):
+        city, state, postal = rng.choice(CITIES)
+        orgs[str(i)] = {
+            "orgID": str(i), "orgName": f"{city} Cat Rescue {i}", "orgLocationCity": city,
+            "orgLocationState": state, "orgLocationPostalcode": postal,
+            "orgPhone": f"555-{rng.randrange(1000, 9999)}", "orgEmail": f"adopt{i}@example.org",
+            "orgUrl": f"https://example.org/orgs/{i}",
+        }
+    return orgs
+
+
+def build_animals(count, orgs, schema, rng):
+    breeds = read_labels("BreedLabels.csv", "BreedName", type_filter="2")
+    colors = read_labels("ColorLabels.csv", "ColorName")
+    animals = {}
+    for i in range(1, count + 1):
+        animal_id = str(1_000_000 + i)
+        org = orgs[rng.choice(list(orgs))]
+        record = {name: fake_value(name, spec, rng, animal_id) for name, spec in schema.items()}
+        record.update({
+            "animalID": animal_id,
+            "animalOrgID": org["orgID"],
+            "animalOrgName": org["orgName"],
+            "animalName": f"Cat {i}",
+            "animalSpecies": "Cat",
+            "animalStatus": rng.choice(STATUSES),
+            "animalBreed": rng.choice(breeds),
+            "animalColor": rng.choice(colors),
+            "animalLocationCitystate": f"{org['orgLocationCity']}, {org['orgLocationState']}",
+            "animalLocationState": org["orgLocationState"],
+            "animalLocationPostalcode": org["orgLocationPostalcode"],
+            "animalDescriptionPlain": f"Cat {i} is looking for a home.",
+            "animalPictures": [{
+                "urlSecureFullsize": f"https://example.org/pictures/{animal_id}.jpg",
+                "urlInsecureFullsize": f"http://example.org/pictures/{animal_id}.jpg",
+            }],
+        })
+        animals[animal_id] = record
+    return animals
+
+
+# -------------------- Query evaluation -------------------- #
+
+def _date_key(value):
+    for fmt in ("%m/%d/%Y %I:%M %p", "%m/%d/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(str(value), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def matches(record, flt):
+    value = record.get(flt.get("fieldName"))
+    criteria = flt.get("criteria")
+    operation = flt.get("operation", "equals")
+    if operation == "equals":
+        if isinstance(criteria, list):
+            return str(value) in {str(c) for c in criteria}
+        return str(value).lower() == str(criteria).lower()
+    if operation == "contains":
+        return str(criteria).lower() in str(value or "").lower()
+    if operation in ("greaterthan", "lessthan"):
+        left, right = _date_key(value), _date_key(criteria)
+        if left is None or right is None:
+            return False
+        return left > right if operation == "greaterthan" else left < right
+    return True
+
+
+def run_search(records, search, id_field):
+    hits = [r for r in records.values() if all(matches(r, f) for f in search.get("filters", []))]
+    sort_field = search.get("resultSort")
+    if sort_field:
+        hits.sort(key=lambda r: _date_key(r.get(sort_field)) or str(r.get(sort_field, "")),
+                  reverse=search.get("resultOrder") == "desc")
+    start = int(search.get("resultStart", 0))
+    page = hits[start:start + int(search.get("resultLimit", 20))]
+    fields = search.get("fields") or []
+    data = {r[id_field]: {f: r.get(f) for f in fields} if fields else r for r in page}
+    return {"status": "ok", "messages": {"generalMessages": [], "recordMessages": []},
+            "foundRows": len(hits), "data": data}
+
+
+# -------------------- Server -------------------- #
+
+class MockRescue:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        schema = load_schema()
+        self.orgs = build_orgs(args.orgs, self.rng)
+        self.animals = build_animals(args.animals, self.orgs, schema, self.rng)
+        self.recordings = self.load_recordings(args.recordings)
+        self.counters = Counter()
+        print(f"🐈 Mock RescueGroups: {len(self.animals)} animals, {len(self.orgs)} orgs, "
+              f"{len(self.recordings)} recordings")
+
+    def load_recordings(self, directory):
+        recordings = {}
+        if directory and os.path.isdir(directory):
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(".json"):
+                    with open(os.path.join(directory, name)) as f:
+                        entry = json.load(f)
+                    recordings[search_key(entry["request"])] = entry["response"]
+        return recordings
+
+    async def record(self, payload):
+        import httpx
+
+        async with httpx.AsyncClient(timeout=30) as client:
+            body = (await client.post(self.args.record_from, json=payload)).json()
+        key = search_key(payload)
+        os.makedirs(self.args.recordings, exist_ok=True)
+        safe = {**payload, "apikey": "REDACTED"}
+        with open(os.path.join(self.args.recordings, key.replace(":", "_") + ".json"), "w") as f:
+            json.dump({"request": safe, "response": body}, f, indent=1)
+        self.recordings[key] = body
+        self.counters["recorded"] += 1
+        return body
+
+    async def handle(self, payload):
+        object_type = payload.get("objectType", "unknown")
+        self.counters[f"calls:{object_type}"] += 1
+        self.counters["calls"] += 1
+
+        delay = max(0.0, self.rng.gauss(self.args.latency_ms, self.args.jitter_ms)) / 1000
+        if self.rng.random() < self.args.timeout_rate:
+            self.counters["injected_timeouts"] += 1
+            await asyncio.sleep(60)
+        await asyncio.sleep(delay)
+        if self.rng.random() < self.args.error_rate:
+            self.counters["injected_errors"] += 1
+            return 500, {"status": "error", "messages": {"generalMessages": [{"messageText": "Injected error"}]}}
+
+        key = search_key(payload)
+        if key in self.recordings:
+            self.counters["replayed"] += 1
+            return 200, self.recordings[key]
+        if self.args.record_from:
+            return 200, await self.record(payload)
+
+        sources = {"animals": (self.animals, "animalID"), "orgs": (self.orgs, "orgID")}
+        if object_type not in sources or payload.get("objectAction") != "publicSearch":
+            return 200, {"status": "error", "messages": {"generalMessages": [{"messageText": "Unsupported"}]}}
+        self.counters["synthetic"] += 1
+        records, id_field = sources[object_type]
+        return 200, run_search(records, payload.get("search") or {}, id_field)
+
+
+def create_app(args):
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+
+    mock = MockRescue(args)
+    app = FastAPI()
+
+    @app.post("/http/v2.json")
+    async def v2(request: Request):
+        status, body = await mock.handle(await request.json())
+        return JSONResponse(body, status_code=status)
+
+    @app.get("/_mock/stats")
+    async def stats():
+        return dict(mock.counters)
+
+    return app
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with HTTP 500")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fraction of calls that hang for 60s")
+    parser.add_argument("--recordings", default=os.path.join(BACKEND_DIR, "bench", "recordings"))
+    parser.add_argument("--record-from", default=None, help="real endpoint to record misses from")
+    parser.add_argument("--animals", type=int, default=5000)
+    parser.add_argument("--orgs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    args = parse_args()
+    uvicorn.run(create_app(args), port=args.port, log_level="warning")
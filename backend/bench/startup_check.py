@@ -0,0 +1,79 @@
+"""Startup budget check for the API process, based on `python -X importtime`.
+
+    python bench/startup_check.py [--module main] [--budget-ms 800] [--top 15]
+
+Imports the module in a fresh interpreter, prints the slowest imports and
+exits non-zero if the total import time exceeds --budget-ms or if any module
+from the analytics stack (pandas, numpy, scikit-learn, Kaggle, ...) was
+imported on the way. Takes the median of --runs runs to smooth out noise.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed by the refresh job or on first prediction, never at API import
+FORBIDDEN = ["pandas", "numpy", "scipy", "sklearn", "joblib", "kaggle", "pyarrow", "schedule"]
+
+
+def import_times(module):
+    """[(module, self_us, cumulative_us)] from one `-X importtime` run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+        # Keep any import-time side effects (inventory DB, org directory) out of the repo
+        env={**os.environ, "INVENTORY_URL": "sqlite://", "INVENTORY_SYNC_INTERVAL": "0"},
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nesting shows as extra indentation after the separator's one space
+        rows.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main")
+    # Measured median ~620 ms (worst 705) for `import main` on a shared 1-vCPU box;
+    # FastAPI + httpx alone are ~420 ms of that
+    parser.add_argument("--budget-ms", type=float, default=800)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    # Top-level entries aren't indented; their cumulative times add up to the total
+    totals = [sum(c for name, _, c in rows if not name.startswith(" ")) / 1000 for rows in runs]
+    total_ms = statistics.median(totals)
+    rows = runs[totals.index(total_ms)] if total_ms in totals else runs[0]
+
+    print(f"import {args.module}: {total_ms:.0f} ms (median of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    print(f"\n{'cumulative ms':>14}{'self ms':>10}  module")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {name.strip()}")
+
+    loaded = {name.strip().split(".")[0] for name, _, _ in rows}
+    heavy = [m for m in FORBIDDEN if m in loaded]
+    failed = False
+    if heavy:
+        print(f"\n❌ Heavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"\n❌ Startup imports take {total_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print("\n✅ Within the startup budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
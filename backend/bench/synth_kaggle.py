@@ -0,0 +1,230 @@
+"""Synthetic stand-ins for the Kaggle sources behind load_kaggle, plus a fake
+Kaggle client that serves them.
+
+    python bench/synth_kaggle.py --rows 1m --out /tmp/purrmatch-synth
+
+Writes one archive per core source with the file names and columns the
+parsers expect (and a few unused columns, like the real files):
+
+    predict-pet-adoption-status-dataset.zip               dataset1
+    pet-adoption-records-with-animal-and-adopter-data.zip  dataset2
+    train.csv                                             dataset3 (local file)
+    analyzing-adoption-trends-at-the-bloomington-ani.zip  dataset4
+    animal-shelter-analytics.zip                          dataset5
+
+Rows are generated with numpy in blocks and streamed into the archive, so
+10M-row sources don't need 10M rows in memory.
+"""
+import argparse
+import csv
+import os
+import shutil
+import sys
+import time
+import zipfile
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOCK_ROWS = 250_000
+
+SPECIES = np.array(["Cat", "Dog", "Rabbit", "Bird"])
+SPECIES_P = [0.45, 0.45, 0.05, 0.05]
+COLOR_WORDS = np.array(["Black", "White", "Gray", "Orange", "Brown", "Tabby", "Calico", "Tortie", "Cream"])
+CONDITIONS = np.array(["Normal", "Injured", "Sick", "Nursing", "Aged", "Feral"])
+INTAKE_TYPES = np.array(["stray", "owner surrender", "public assist", "euthanasia request"])
+REASONS = np.array(["Moving", "Too many animals", "Landlord issues", "Allergies", "Behaviour", ""])
+
+
+def parse_rows(value):
+    """'10k' / '1m' / '10M' / '2500' → int."""
+    value = str(value).strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value[:-1] if scale > 1 else value) * scale)
+
+
+def read_labels(filename):
+    with open(os.path.join(BACKEND_DIR, "data", filename), newline="") as f:
+        return [row for row in csv.DictReader(f)]
+
+
+def breed_names(rng, n, labels):
+    names = np.array([r["BreedName"] for r in labels] + ["DSH", "domestic shorthair", "Siamese Mix"])
+    return names[rng.integers(0, len(names), n)]
+
+
+def dates(rng, n, start="2018-01-01", days=2000):
+    base = np.datetime64(start)
+    return (base + rng.integers(0, days, n).astype("timedelta64[D]")).astype(str)
+
+
+# -------------------- One block per source -------------------- #
+
+def block_dataset1(rng, start, n, ctx):
+    return pd.DataFrame({
+        "PetID": np.arange(start, start + n),
+        "PetType": rng.choice(SPECIES, n, p=SPECIES_P),
+        "Breed": breed_names(rng, n, ctx["breeds"]),
+        "AgeMonths": rng.integers(1, 180, n),
+        "Color": rng.choice(COLOR_WORDS, n),
+        "Size": rng.choice(["Small", "Medium", "Large"], n),
+        "WeightKg": rng.uniform(1, 30, n).round(2),
+        "Vaccinated": rng.integers(0, 2, n),
+        "HealthCondition": rng.integers(0, 2, n),
+        "TimeInShelterDays": rng.integers(0, 120, n),
+        "AdoptionFee": rng.integers(0, 500, n),
+        "PreviousOwner": rng.integers(0, 2, n),
+        "AdoptionLikelihood": rng.integers(0, 2, n),
+    })
+
+
+def block_dataset2(rng, start, n, ctx):
+    arrival = np.datetime64("2019-01-01") + rng.integers(0, 1500, n).astype("timedelta64[D]")
+    adopted = rng.integers(0, 2, n)
+    adoption = (arrival + rng.integers(0, 200, n).astype("timedelta64[D]")).astype(str)
+    adoption[adopted == 0] = ""
+    return pd.DataFrame({
+        "pet_id": np.arange(start, start + n),
+        "species": rng.choice(SPECIES, n, p=SPECIES_P),
+        "breed": breed_names(rng, n, ctx["breeds"]),
+        "color": rng.choice(COLOR_WORDS, n),
+        "age_years": rng.uniform(0.1, 15, n).round(1),
+        "arrival_date": arrival.astype(str),
+        "adoption_date": adoption,
+        "adopted": adopted,
+        "adopter_id": rng.integers(1, 100_000, n),
+    })
+
+
+def block_dataset3(rng, start, n, ctx):
+    breed_ids = np.array([int(r["BreedID"]) for r in ctx["breeds"]])
+    color_ids = np.array([int(r["ColorID"]) for r in ctx["colors"]])
+    return pd.DataFrame({
+        "Type": rng.integers(1, 3, n),
+        "Name": np.char.add("Pet", np.arange(start, start + n).astype(str)),
+        "Age": rng.integers(0, 120, n),
+        "Breed1": breed_ids[rng.integers(0, len(breed_ids), n)],
+        "Gender": rng.integers(1, 4, n),
+        "Color1": color_ids[rng.integers(0, len(color_ids), n)],
+        "Health": rng.integers(1, 4, n),
+        "Fee": rng.integers(0, 300, n),
+        "PetID": np.char.add("p", np.arange(start, start + n).astype(str)),
+        "AdoptionSpeed": rng.integers(0, 5, n),
+    })
+
+
+def block_dataset4(rng, start, n, ctx):
+    return pd.DataFrame({
+        "id": np.arange(start, start + n),
+        "animalname": np.char.add("Animal", np.arange(start, start + n).astype(str)),
+        "speciesname": rng.choice(SPECIES, n, p=SPECIES_P),
+        "breedname": breed_names(rng, n, ctx["breeds"]),
+        "basecolour": rng.choice(COLOR_WORDS, n),
+        "intakedate": dates(rng, n),
+        "intakereason": rng.choice(REASONS, n),
+        "returnedreason": rng.choice(REASONS, n),
+        "movementdate": dates(rng, n, start="2018-03-01"),
+        "movementtype": rng.choice(["Adoption", "Foster", "Transfer"], n),
+    })
+
+
+def block_dataset5(rng, start, n, ctx):
+    return pd.DataFrame({
+        "Animal ID": np.char.add("A", np.arange(start, start + n).astype(str)),
+        "Animal Type": rng.choice(SPECIES, n, p=SPECIES_P),
+        "Breed": breed_names(rng, n, ctx["breeds"]),
+        "Color": rng.choice(COLOR_WORDS, n),
+        "Intake Condition": rng.choice(CONDITIONS, n),
+        "Intake Type": rng.choice(INTAKE_TYPES, n),
+        "DateTime": dates(rng, n),
+    })
+
+
+# (name, Kaggle ref, archive, member inside the zip or None for a plain CSV, block builder)
+SOURCES = [
+    ("dataset1", "rabieelkharoua/predict-pet-adoption-status-dataset",
+     "predict-pet-adoption-status-dataset.zip", "pet_adoption_data.csv", block_dataset1),
+    ("dataset2", "chaudharisanika/pet-adoption-records-with-animal-and-adopter-data",
+     "pet-adoption-records-with-animal-and-adopter-data.zip", "pet_adoption_center.csv", block_dataset2),
+    ("dataset3", None, "train.csv", None, block_dataset3),
+    ("dataset4", "thedevastator/analyzing-adoption-trends-at-the-bloomington-ani",
+     "analyzing-adoption-trends-at-the-bloomington-ani.zip", "animals.csv", block_dataset4),
+    ("dataset5", "jackdaoud/animal-shelter-analytics",
+     "animal-shelter-analytics.zip", "Austin_Animal_Center_Intakes.csv", block_dataset5),
+]
+
+
+def write_source(path, member, build_block, rows, seed, ctx):
+    rng = np.random.default_rng(seed)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as raw:
+        if member:
+            archive = zipfile.ZipFile(raw, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1)
+            out = archive.open(member, "w", force_zip64=True)
+        else:
+            archive, out = None, raw
+        try:
+            for start in range(0, rows, BLOCK_ROWS):
+                block = build_block(rng, start, min(BLOCK_ROWS, rows - start), ctx)
+                out.write(block.to_csv(index=False, header=start == 0).encode())
+        finally:
+            if archive is not None:
+                out.close()
+                archive.close()
+    os.replace(tmp_path, path)
+
+
+def generate(out_dir, rows, seed=0):
+    """Write every synthetic source into out_dir; returns {archive: path}."""
+    os.makedirs(out_dir, exist_ok=True)
+    ctx = {"breeds": [r for r in read_labels("BreedLabels.csv") if r.get("Type") == "2"],
+           "colors": read_labels("ColorLabels.csv")}
+    paths = {}
+    for i, (name, _, archive, member, build_block) in enumerate(SOURCES):
+        path = os.path.join(out_dir, archive)
+        started = time.perf_counter()
+        write_source(path, member, build_block, rows, seed + i, ctx)
+        print(f"🧪 {name}: {rows} rows → {path} ({os.path.getsize(path) / 1e6:.1f} MB, "
+              f"{time.perf_counter() - started:.1f}s)")
+        paths[archive] = path
+    return paths
+
+
+class FakeKaggleApi:
+    """Just enough of KaggleApi for load_kaggle: dataset_list() and
+    dataset_download_files(), served from a directory of archives."""
+
+    def __init__(self, archive_dir, version=1):
+        self.archive_dir = archive_dir
+        self.version = version
+        self.datasets = {
+            ref: archive for _, ref, archive, member, _ in SOURCES if ref and member
+        }
+
+    def _dataset(self, ref):
+        return SimpleNamespace(ref=ref, title=ref.split("/")[-1], current_version_number=self.version,
+                               last_updated=f"2024-01-01 00:00:{self.version:02d}")
+
+    def dataset_list(self, search=None, user=None, sort_by=None):
+        return [self._dataset(ref) for ref in self.datasets
+                if (user is None or ref.startswith(user + "/")) and (search is None or search in ref)]
+
+    def dataset_download_files(self, ref, path=".", quiet=True):
+        archive = self.datasets[ref]
+        shutil.copyfile(os.path.join(self.archive_dir, archive), os.path.join(path, archive))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10k", help="rows per source, e.g. 10k, 1m, 10m")
+    parser.add_argument("--out", default=None, help="output directory (default /tmp/purrmatch-synth-<rows>)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rows = parse_rows(args.rows)
+    generate(args.out or f"/tmp/purrmatch-synth-{rows}", rows, args.seed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
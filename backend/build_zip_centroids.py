@@ -0,0 +1,57 @@
+"""Build data/zip_centroids.csv (zip,lat,lon) from the Census Gazetteer ZCTA file.
+
+    python build_zip_centroids.py                    # download the national file
+    python build_zip_centroids.py 2023_Gaz_zcta_national.zip   # or use a local copy (.zip or .txt)
+
+The API reads the result offline for radius search (see geo.py).
+"""
+import csv
+import io
+import os
+import sys
+import zipfile
+
+import requests
+
+from geo import ZIP_CENTROIDS_PATH
+
+GAZETTEER_URL = os.getenv(
+    "GAZETTEER_URL",
+    "https://www2.census.gov/geo/docs/maps-data/data/gazetteer/2023_Gazetteer/2023_Gaz_zcta_national.zip",
+)
+
+
+def read_gazetteer(raw):
+    """Gazetteer bytes (zip or tab-separated text) → [(zip, lat, lon)]."""
+    if raw[:2] == b"PK":
+        with zipfile.ZipFile(io.BytesIO(raw)) as zf:
+            raw = zf.read(next(n for n in zf.namelist() if n.endswith(".txt")))
+    reader = csv.reader(io.StringIO(raw.decode("utf-8-sig")), delimiter="\t")
+    # The last header cell carries trailing padding, so match on stripped names
+    header = [h.strip() for h in next(reader)]
+    geoid, lat, lon = header.index("GEOID"), header.index("INTPTLAT"), header.index("INTPTLONG")
+    return [(row[geoid].strip(), float(row[lat]), float(row[lon])) for row in reader if row]
+
+
+def build(source=None, path=ZIP_CENTROIDS_PATH):
+    if source:
+        with open(source, "rb") as f:
+            raw = f.read()
+    else:
+        print(f"⬇️ Downloading {GAZETTEER_URL}")
+        response = requests.get(GAZETTEER_URL, timeout=60)
+        response.raise_for_status()
+        raw = response.content
+
+    rows = read_gazetteer(raw)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["zip", "lat", "lon"])
+        writer.writerows((z, f"{lat:.6f}", f"{lon:.6f}") for z, lat, lon in sorted(rows))
+    os.replace(path + ".tmp", path)
+    print(f"📍 Wrote {len(rows)} ZIP centroids to {path}")
+
+
+if __name__ == "__main__":
+    build(sys.argv[1] if len(sys.argv) > 1 else None)
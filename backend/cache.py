@@ -0,0 +1,269 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import detach_request
+
+# -------------------- Backends -------------------- #
+# Backends are async so a network store never blocks the event loop.
+
+class MemoryBackend:
+    """In-process LRU store bounded by number of entries."""
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    async def get_many(self, keys):
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key, entry, expire_in):
+        """Store an entry; returns how many old entries were evicted to make room."""
+        evicted = 0
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    async def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    async def size(self):
+        return len(self._entries)
+
+    async def close(self):
+        pass
+
+
+class RedisBackend:
+    """Redis-compatible store (Redis, Valkey, KeyDB...). Size is bounded by the
+    server's maxmemory/LRU policy; entries also expire on their own.
+
+    Keys are indexed in a sorted set scored by expiry time, so size() is one
+    ZCOUNT instead of a keyspace scan. Entries the server evicts early stay
+    counted until their expiry.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="purrmatch:"):
+        import redis.asyncio as redis  # optional dependency (redis>=5), only needed for this backend
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.index = prefix + "__keys"
+
+    async def get(self, key):
+        raw = await self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def get_many(self, keys):
+        if not keys:
+            return []
+        raws = await self.client.mget([self.prefix + key for key in keys])
+        return [json.loads(raw) if raw is not None else None for raw in raws]
+
+    async def set(self, key, entry, expire_in):
+        expire_in = max(1, int(expire_in))
+        now = time.time()
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(self.prefix + key, json.dumps(entry), ex=expire_in)
+            pipe.zadd(self.index, {key: now + expire_in})
+            pipe.zremrangebyscore(self.index, "-inf", now)
+            await pipe.execute()
+        return 0
+
+    async def delete(self, key):
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.delete(self.prefix + key)
+            pipe.zrem(self.index, key)
+            await pipe.execute()
+
+    async def size(self):
+        return await self.client.zcount(self.index, time.time(), "+inf")
+
+    async def close(self):
+        await self.client.aclose()
+
+
+# -------------------- Cache -------------------- #
+
+class ResponseCache:
+    """TTL cache with stale-while-revalidate on top of a pluggable backend.
+
+    Entries younger than `ttl` are served as-is. Entries older than `ttl` but
+    younger than `ttl + stale_ttl` are still served, while a background task
+    fetches a fresh copy. Anything older is a miss.
+    """
+
+    def __init__(self, backend, ttl=300, stale_ttl=600):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.counters = {"hits": 0, "stale_hits": 0, "misses": 0,
+                         "revalidations": 0, "evictions": 0, "errors": 0}
+        self._refreshing = set()
+        self._tasks = set()
+        self._lock = threading.Lock()
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    async def get(self, key, ttl=None):
+        """Return (value, state) where state is 'fresh', 'stale' or None."""
+        try:
+            entry = await self.backend.get(key)
+        except Exception as e:
+            print(f"⚠️ Cache backend error on get: {e}")
+            self._count("errors")
+            return None, None
+        return self._state(entry, ttl)
+
+    async def get_many(self, keys, ttl=None):
+        """get() for several keys in one backend round trip, in order."""
+        try:
+            entries = await self.backend.get_many(keys)
+        except Exception as e:
+            print(f"⚠️ Cache backend error on get: {e}")
+            self._count("errors")
+            return [(None, None)] * len(keys)
+        return [self._state(entry, ttl) for entry in entries]
+
+    def _state(self, entry, ttl):
+        ttl = self.ttl if ttl is None else ttl
+        if entry is None:
+            return None, None
+        age = time.time() - entry["stored_at"]
+        if age < ttl:
+            return entry["value"], "fresh"
+        if age < ttl + self.stale_ttl:
+            return entry["value"], "stale"
+        return None, None
+
+    async def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        entry = {"value": value, "stored_at": time.time()}
+        try:
+            evicted = await self.backend.set(key, entry, ttl + self.stale_ttl)
+        except Exception as e:
+            print(f"⚠️ Cache backend error on set: {e}")
+            self._count("errors")
+            return
+        if evicted:
+            self._count("evictions", evicted)
+
+    async def get_or_fetch(self, key, fetch, ttl=None, cacheable=None):
+        """Serve `key` from cache, awaiting the coroutine `fetch()` on a miss.
+
+        `cacheable(value)` can reject responses (e.g. upstream errors) so they
+        are returned to the caller but never stored.
+        """
+        value, state = await self.get(key, ttl)
+        if state == "fresh":
+            self._count("hits")
+            return value
+        if state == "stale":
+            self._count("stale_hits")
+            self._revalidate(key, fetch, ttl, cacheable)
+            return value
+
+        self._count("misses")
+        value = await fetch()
+        if cacheable is None or cacheable(value):
+            await self.set(key, value, ttl)
+        return value
+
+    def _revalidate(self, key, fetch, ttl, cacheable):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        async def run():
+            detach_request()
+            try:
+                value = await fetch()
+                if cacheable is None or cacheable(value):
+                    await self.set(key, value, ttl)
+                self._count("revalidations")
+            except Exception as e:
+                print(f"⚠️ Background refresh failed for {key}: {e}")
+                self._count("errors")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 4) if lookups else 0.0
+        try:
+            stats["entries"] = await self.backend.size()
+        except Exception:
+            stats["entries"] = None
+        return stats
+
+    async def close(self):
+        await self.backend.close()
+
+
+# -------------------- Keys -------------------- #
+
+def search_key(payload):
+    """Cache key for a publicSearch payload, independent of API key, field
+    order, filter order and letter case of the criteria."""
+    search = payload.get("search", {})
+    filters = []
+    for f in search.get("filters", []):
+        criteria = f.get("criteria")
+        if isinstance(criteria, str):
+            criteria = criteria.strip().lower()
+        filters.append([f.get("fieldName"), f.get("operation"), criteria])
+    filters.sort(key=lambda f: json.dumps(f, sort_keys=True))
+
+    normalized = {
+        "objectType": payload.get("objectType"),
+        "objectAction": payload.get("objectAction"),
+        "fields": sorted(search.get("fields", [])),
+        "filters": filters,
+        "resultStart": int(search.get("resultStart", 0)),
+        "resultLimit": int(search.get("resultLimit", 0)),
+    }
+    digest = hashlib.sha1(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+    return f"search:{normalized['objectType']}:{digest}"
+
+
+def animal_key(animal_id):
+    return f"animal:{animal_id}"
+
+
+# -------------------- Default instance -------------------- #
+
+def cache_from_env():
+    """Build the shared cache from CACHE_* environment variables."""
+    ttl = int(os.getenv("CACHE_TTL", 300))
+    stale_ttl = int(os.getenv("CACHE_STALE_TTL", 600))
+    if os.getenv("CACHE_BACKEND", "memory").lower() == "redis":
+        backend = RedisBackend(os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"))
+    else:
+        backend = MemoryBackend(int(os.getenv("CACHE_MAX_ENTRIES", 5000)))
+    return ResponseCache(backend, ttl=ttl, stale_ttl=stale_ttl)
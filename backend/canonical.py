@@ -0,0 +1,155 @@
+import csv
+import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# PetFinder's BreedLabels.csv uses Type 2 for cat breeds
+CAT_TYPE = "2"
+
+# Shorthand seen in shelter data, expanded per token before matching
+ABBREVIATIONS = {
+    "dsh": "domestic short hair",
+    "dmh": "domestic medium hair",
+    "dlh": "domestic long hair",
+    "sh": "short hair",
+    "mh": "medium hair",
+    "lh": "long hair",
+    "shorthair": "short hair",
+    "mediumhair": "medium hair",
+    "longhair": "long hair",
+    "grey": "gray",
+    "tortie": "tortoiseshell",
+    "tort": "tortoiseshell",
+}
+# Words that don't change which breed/color is meant
+NOISE_WORDS = {"mix", "mixed", "cat", "breed"}
+
+_PUNCTUATION = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_key(value):
+    """'Domestic Short-Hair Mix' / 'DSH' / 'domestic shorthair' → 'domesticshorthair'."""
+    tokens = _PUNCTUATION.sub(" ", str(value).lower()).split()
+    expanded = []
+    for token in tokens:
+        expanded.extend(ABBREVIATIONS.get(token, token).split())
+    return "".join(t for t in expanded if t not in NOISE_WORDS)
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CanonicalIndex:
+    """Maps free-text labels onto a fixed vocabulary in three tiers:
+
+      1. exact   – the raw string is a known label or alias
+      2. token   – same normalized key (case, punctuation, abbreviations, noise words)
+      3. fuzzy   – best trigram Dice similarity ≥ threshold, via an inverted index
+
+    Anything else is returned unchanged (whitespace-trimmed). Resolved strings
+    are kept in an LRU so repeated unseen values cost one dict lookup.
+    """
+
+    def __init__(self, labels, aliases=None, threshold=0.65, cache_size=100_000):
+        self.labels = list(dict.fromkeys(labels))
+        self.threshold = threshold
+        self.exact = {label: label for label in self.labels}
+        self.by_key = {}
+        for label in self.labels:
+            self.by_key.setdefault(normalize_key(label), label)
+        for alias, label in (aliases or {}).items():
+            self.exact[alias] = label
+            self.by_key.setdefault(normalize_key(alias), label)
+
+        self._grams = {}
+        self._postings = defaultdict(list)
+        for key in self.by_key:
+            grams = trigrams(key)
+            self._grams[key] = len(grams)
+            for gram in grams:
+                self._postings[gram].append(key)
+
+        self.counters = {"exact": 0, "token": 0, "fuzzy": 0, "unmatched": 0}
+        self._cached = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _fuzzy(self, key):
+        grams = trigrams(key)
+        overlap = defaultdict(int)
+        for gram in grams:
+            for candidate in self._postings.get(gram, ()):
+                overlap[candidate] += 1
+        best, best_score = None, 0.0
+        for candidate, shared in overlap.items():
+            score = 2 * shared / (len(grams) + self._grams[candidate])
+            if score > best_score:
+                best, best_score = candidate, score
+        return self.by_key[best] if best_score >= self.threshold else None
+
+    def _resolve(self, value):
+        label = self.exact.get(value)
+        if label is not None:
+            self.counters["exact"] += 1
+            return label
+        key = normalize_key(value)
+        label = self.by_key.get(key)
+        if label is not None:
+            self.counters["token"] += 1
+            return label
+        label = self._fuzzy(key) if key else None
+        if label is not None:
+            self.counters["fuzzy"] += 1
+            return label
+        self.counters["unmatched"] += 1
+        return value.strip()
+
+    def canonicalize(self, value):
+        """Canonical label for one value (None/empty pass through)."""
+        if value is None or not isinstance(value, str) or not value.strip():
+            return value
+        return self._cached(value)
+
+    def canonicalize_series(self, series):
+        """Vectorized: resolve each distinct value once, then broadcast back."""
+        import numpy as np
+        import pandas as pd
+
+        codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=True)
+        mapped = np.array([self.canonicalize(u) for u in uniques] + [None], dtype=object)
+        # code -1 (missing) picks the trailing None
+        return pd.Series(mapped[codes], index=series.index, name=series.name)
+
+
+# -------------------- Shared indexes -------------------- #
+
+def _read_labels(filename, column, type_filter=None):
+    with open(os.path.join(DATA_DIR, filename), newline="") as f:
+        return [
+            row[column].strip() for row in csv.DictReader(f)
+            if row.get(column) and (type_filter is None or row.get("Type") == type_filter)
+        ]
+
+
+@lru_cache(maxsize=None)
+def breed_index():
+    return CanonicalIndex(
+        _read_labels("BreedLabels.csv", "BreedName", type_filter=CAT_TYPE),
+        aliases={"Sphynx": "Sphynx (hairless cat)", "Polydactyl": "Extra-Toes Cat (Hemingway Polydactyl)"},
+    )
+
+
+@lru_cache(maxsize=None)
+def color_index():
+    return CanonicalIndex(_read_labels("ColorLabels.csv", "ColorName"))
+
+
+def canonical_breed(value):
+    return breed_index().canonicalize(value)
+
+
+def canonical_color(value):
+    return color_index().canonicalize(value)
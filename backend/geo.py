@@ -0,0 +1,115 @@
+import csv
+import math
+import os
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# zip,lat,lon — generated offline by build_zip_centroids.py
+ZIP_CENTROIDS_PATH = os.getenv("ZIP_CENTROIDS_PATH", os.path.join(DATA_DIR, "zip_centroids.csv"))
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LAT = 69.0
+MAX_RADIUS_MILES = 500
+
+
+class GeoUnavailable(Exception):
+    pass
+
+
+@lru_cache(maxsize=None)
+def load_zip_centroids(path=ZIP_CENTROIDS_PATH):
+    """5-digit ZIP → (lat, lon)."""
+    try:
+        with open(path, newline="") as f:
+            return {row["zip"]: (float(row["lat"]), float(row["lon"])) for row in csv.DictReader(f)}
+    except FileNotFoundError:
+        raise GeoUnavailable(f"ZIP centroid table not found at {path}; run build_zip_centroids.py")
+
+
+def zip5(postal_code):
+    """'02139-4307' / '2139' → '02139' (None if it doesn't look like a US ZIP)."""
+    digits = str(postal_code or "").strip().split("-")[0]
+    if not digits.isdigit() or len(digits) > 5:
+        return None
+    return digits.zfill(5)
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+class GridIndex:
+    """Points bucketed into cell_deg × cell_deg lat/lon cells.
+
+    A radius query only visits the cells overlapping the query's bounding box,
+    then filters by exact haversine distance.
+    """
+
+    def __init__(self, points=(), cell_deg=0.5):
+        self.cell_deg = cell_deg
+        self._cells = defaultdict(list)
+        self.size = 0
+        for key, lat, lon in points:
+            self._cells[self._cell(lat, lon)].append((key, lat, lon))
+            self.size += 1
+
+    def _cell(self, lat, lon):
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def within(self, lat, lon, radius_miles):
+        """[(key, miles)] within radius_miles, nearest first."""
+        dlat = radius_miles / MILES_PER_DEGREE_LAT
+        # Longitude degrees shrink towards the poles; clamp so the box stays finite
+        dlon = radius_miles / (MILES_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+        lat_lo, lon_lo = self._cell(lat - dlat, lon - dlon)
+        lat_hi, lon_hi = self._cell(lat + dlat, lon + dlon)
+
+        hits = []
+        for i in range(lat_lo, lat_hi + 1):
+            for j in range(lon_lo, lon_hi + 1):
+                for key, plat, plon in self._cells.get((i, j), ()):
+                    miles = haversine_miles(lat, lon, plat, plon)
+                    if miles <= radius_miles:
+                        hits.append((key, miles))
+        hits.sort(key=lambda h: h[1])
+        return hits
+
+
+class ShelterGeoIndex:
+    """Grid index over shelters located by orgLocationPostalcode.
+
+    Rebuilt lazily whenever the org directory's version changes.
+    """
+
+    def __init__(self, org_directory, centroids_path=ZIP_CENTROIDS_PATH, cell_deg=0.5):
+        self.org_directory = org_directory
+        self.centroids_path = centroids_path
+        self.cell_deg = cell_deg
+        self._index = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        version = self.org_directory.version
+        if self._index is not None and self._version == version:
+            return self._index
+        with self._lock:
+            if self._index is None or self._version != version:
+                centroids = load_zip_centroids(self.centroids_path)
+                points = []
+                for org_id, record in self.org_directory.records():
+                    centroid = centroids.get(zip5(record.get("orgLocationPostalcode")))
+                    if centroid:
+                        points.append((org_id, *centroid))
+                self._index = GridIndex(points, self.cell_deg)
+                self._version = version
+                print(f"📍 Shelter geo index: {self._index.size} of {len(self.org_directory)} orgs located")
+        return self._index
+
+    def nearby(self, lat, lon, radius_miles):
+        """{org_id: miles} for shelters within radius_miles, nearest first."""
+        return dict(self.refresh().within(lat, lon, radius_miles))
@@ -0,0 +1,358 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    Column, DateTime, Float, Index, MetaData, String, Table, Text,
+    create_engine, delete, func, select,
+)
+from sqlalchemy.dialects.sqlite import insert
+
+from paths import STATE_DIR
+from records import SEARCH_FIELDS, format_cat
+
+INVENTORY_URL = os.getenv("INVENTORY_URL", f"sqlite:///{os.path.join(STATE_DIR, 'inventory.db')}")
+
+SYNC_FIELDS = SEARCH_FIELDS + ["animalStatus", "animalLocationState"]
+# After this long without a successful sync, searches go back to upstream
+INVENTORY_MAX_AGE = int(os.getenv("INVENTORY_MAX_AGE", 3600))
+
+# Bump whenever cats_table's columns change; existing databases are rebuilt
+# and fully re-synced on startup (create_all never alters tables). New
+# indexes are just created when missing.
+SCHEMA_VERSION = 2
+
+metadata = MetaData()
+
+cats_table = Table(
+    "cats", metadata,
+    Column("id", String, primary_key=True),
+    Column("name", String),
+    Column("breed", String),
+    Column("color", String),
+    Column("sex", String),
+    Column("general_age", String),
+    Column("city", String),   # lower-cased for case-insensitive lookups
+    Column("state", String),  # upper-cased two-letter code
+    Column("location", String),
+    Column("image", Text),
+    Column("description", Text),
+    Column("available_date", String),
+    Column("updated_date", String),
+    Column("updated_at", DateTime),
+    Column("org_id", String),
+    Index("ix_cats_state_city", "state", "city"),
+    Index("ix_cats_breed", "breed"),
+    Index("ix_cats_sex", "sex"),
+    Index("ix_cats_updated_at", "updated_at"),
+    # Covers radius searches: shelter lookup plus the within-shelter ordering
+    Index("ix_cats_org_id", "org_id", "updated_at", "id"),
+)
+
+# Per-connection scratch table of {org_id: miles} for radius searches
+near_orgs_table = Table(
+    "near_orgs", MetaData(),
+    Column("org_id", String, primary_key=True),
+    Column("miles", Float),
+    prefixes=["TEMPORARY"],
+)
+
+sync_state_table = Table(
+    "sync_state", metadata,
+    Column("key", String, primary_key=True),
+    Column("value", String),
+)
+
+# Formats RescueGroups has been seen to use for animalUpdatedDate
+DATE_FORMATS = ["%m/%d/%Y %I:%M %p", "%m/%d/%Y %H:%M", "%m/%d/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]
+
+
+def parse_rescue_date(value):
+    if not value:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def split_city_state(citystate):
+    """'Portland, OR' -> ('portland', 'OR')."""
+    if not citystate:
+        return None, None
+    city, _, state = citystate.rpartition(",")
+    if not city:
+        return citystate.strip().lower(), None
+    return city.strip().lower(), state.strip().upper() or None
+
+
+def record_to_row(record):
+    cat = format_cat(record)
+    city, state = split_city_state(record.get("animalLocationCitystate"))
+    return {
+        "id": str(cat["id"]),
+        "name": cat["name"],
+        "breed": cat["breed"],
+        "color": cat["color"],
+        "sex": cat["sex"],
+        "general_age": cat["age"],
+        "city": city,
+        "state": (record.get("animalLocationState") or state or "").upper() or None,
+        "location": cat["location"],
+        "image": cat["image"],
+        "description": cat["description"],
+        "available_date": cat["animalAvailableDate"],
+        "updated_date": cat["animalUpdatedDate"],
+        "updated_at": parse_rescue_date(cat["animalUpdatedDate"]),
+        "org_id": str(record["animalOrgID"]) if record.get("animalOrgID") else None,
+    }
+
+
+def row_to_cat(row):
+    return {
+        "id": row.id,
+        "name": row.name,
+        "breed": row.breed,
+        "color": row.color,
+        "sex": row.sex,
+        "image": row.image,
+        "description": row.description,
+        "location": row.location,
+        "age": row.general_age,
+        "animalAvailableDate": row.available_date,
+        "animalUpdatedDate": row.updated_date,
+    }
+
+
+class Inventory:
+    """Local SQLite index of available cats, kept in sync with RescueGroups."""
+
+    def __init__(self, url=INVENTORY_URL, max_age=INVENTORY_MAX_AGE):
+        if url.startswith("sqlite:///"):
+            os.makedirs(os.path.dirname(url[len("sqlite:///"):]) or ".", exist_ok=True)
+        self.engine = create_engine(url, connect_args={"check_same_thread": False})
+        metadata.create_all(self.engine)
+        self._migrate()
+        self.max_age = timedelta(seconds=max_age)
+        self._last_sync = None
+
+    def _migrate(self):
+        """Recreate the cats table if it was built for another SCHEMA_VERSION.
+        Sync state is cleared with it, so the next sync is a full one and old
+        rows don't linger without the new columns."""
+        if self.get_state("schema_version") == str(SCHEMA_VERSION):
+            with self.engine.begin() as conn:
+                for index in cats_table.indexes:
+                    index.create(conn, checkfirst=True)
+            return
+        with self.engine.begin() as conn:
+            cats_table.drop(conn, checkfirst=True)
+            cats_table.create(conn)
+            conn.execute(delete(sync_state_table))
+            self.set_state(conn, "schema_version", str(SCHEMA_VERSION))
+        print(f"🗂️ Inventory schema is now v{SCHEMA_VERSION}; the next sync will be a full one")
+
+    # ---- sync state
+    def get_state(self, key):
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(sync_state_table.c.value).where(sync_state_table.c.key == key)
+            ).scalar()
+
+    def set_state(self, conn, key, value):
+        stmt = insert(sync_state_table).values(key=key, value=value)
+        conn.execute(stmt.on_conflict_do_update(index_elements=["key"], set_={"value": value}))
+
+    def watermark(self):
+        value = self.get_state("watermark")
+        return datetime.fromisoformat(value) if value else None
+
+    def last_sync(self):
+        if self._last_sync is None:
+            value = self.get_state("last_sync")
+            self._last_sync = datetime.fromisoformat(value) if value else None
+        return self._last_sync
+
+    def is_ready(self):
+        """True while the last successful sync is younger than max_age."""
+        last_sync = self.last_sync()
+        return last_sync is not None and datetime.now() - last_sync < self.max_age
+
+    # ---- writes
+    def apply(self, records):
+        """Upsert available cats and drop ones that are no longer available.
+        Returns the newest animalUpdatedDate seen in the batch."""
+        available = [record_to_row(r) for r in records if r.get("animalStatus", "Available") == "Available"]
+        gone = [str(r["animalID"]) for r in records if r.get("animalStatus", "Available") != "Available"]
+
+        with self.engine.begin() as conn:
+            if available:
+                stmt = insert(cats_table)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["id"],
+                    set_={c.name: stmt.excluded[c.name] for c in cats_table.columns if c.name != "id"},
+                )
+                conn.execute(stmt, available)
+            if gone:
+                conn.execute(delete(cats_table).where(cats_table.c.id.in_(gone)))
+
+        dates = [d for d in (parse_rescue_date(r.get("animalUpdatedDate")) for r in records) if d]
+        return max(dates) if dates else None
+
+    def finish_sync(self, watermark):
+        """Record a sync that ran to completion (never call it after an error)."""
+        now = datetime.now()
+        with self.engine.begin() as conn:
+            if watermark:
+                self.set_state(conn, "watermark", watermark.isoformat())
+            self.set_state(conn, "last_sync", now.isoformat())
+        self._last_sync = now
+
+    # ---- reads
+    def search(self, city="", state="", limit=9, page=1):
+        """One page of cats plus the total number of matches. Location filters
+        match the upstream search: a case-insensitive substring of "City, ST"
+        (or of the city alone), or an exact state code."""
+        city, state = city.strip(), state.strip().upper()
+        conditions = []
+        if city and state:
+            conditions.append(cats_table.c.location.contains(f"{city}, {state}", autoescape=True))
+        elif city:
+            conditions.append(cats_table.c.location.contains(city, autoescape=True))
+        elif state:
+            conditions.append(cats_table.c.state == state)
+
+        with self.engine.connect() as conn:
+            total = conn.execute(
+                select(func.count()).select_from(cats_table).where(*conditions)
+            ).scalar()
+            rows = conn.execute(
+                select(cats_table).where(*conditions)
+                # id breaks ties so pages never overlap or skip
+                .order_by(cats_table.c.updated_at.desc(), cats_table.c.id)
+                .limit(limit).offset((page - 1) * limit)
+            ).all()
+        return [row_to_cat(r) for r in rows], total
+
+    def search_near(self, org_distances, limit=9, page=1):
+        """One page of cats at the given shelters, nearest shelter first, plus
+        the total. org_distances: {org_id: miles}.
+
+        Distances go into a temp table so SQLite does the filtering, ordering
+        and paging: the page's ids are picked from ix_cats_org_id alone, and
+        only those rows are read in full."""
+        if not org_distances:
+            return [], 0
+        near = near_orgs_table
+        at_near_org = cats_table.c.org_id.in_(select(near.c.org_id))
+        miles = select(near.c.miles).where(near.c.org_id == cats_table.c.org_id).scalar_subquery()
+        with self.engine.begin() as conn:
+            near.drop(conn, checkfirst=True)
+            near.create(conn)
+            try:
+                conn.execute(insert(near), [{"org_id": str(k), "miles": v} for k, v in org_distances.items()])
+                total = conn.execute(select(func.count()).select_from(cats_table).where(at_near_org)).scalar()
+                page_ids = conn.execute(
+                    select(cats_table.c.id, miles.label("miles")).where(at_near_org)
+                    .order_by(miles, cats_table.c.updated_at.desc(), cats_table.c.id)
+                    .limit(limit).offset((page - 1) * limit)
+                ).all()
+                rows = {r.id: r for r in conn.execute(
+                    select(cats_table).where(cats_table.c.id.in_([r.id for r in page_ids]))
+                )}
+            finally:
+                near.drop(conn)
+
+        cats = []
+        for r in page_ids:
+            cat = row_to_cat(rows[r.id])
+            cat["distance_miles"] = round(r.miles, 1)
+            cats.append(cat)
+        return cats, total
+
+    def org_ids(self):
+        with self.engine.connect() as conn:
+            return [r[0] for r in conn.execute(select(cats_table.c.org_id).distinct()) if r[0]]
+
+    def count(self):
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(cats_table)).scalar()
+
+
+# -------------------- Sync -------------------- #
+
+async def sync_inventory(inventory, client, api_key, page_size=500, on_orgs=None):
+    """Pull cats changed since the last watermark (or every available cat on
+    the first run) and apply them to the local index."""
+    watermark = await asyncio.to_thread(inventory.watermark)
+    filters = [{"fieldName": "animalSpecies", "operation": "equals", "criteria": "Cat"}]
+    if watermark:
+        # Back off a day: the filter only has date precision and upserts are idempotent
+        since = (watermark - timedelta(days=1)).strftime("%Y-%m-%d")
+        filters.append({"fieldName": "animalUpdatedDate", "operation": "greaterthan", "criteria": since})
+    else:
+        filters.append({"fieldName": "animalStatus", "operation": "equals", "criteria": "Available"})
+
+    newest, synced, start = watermark, 0, 0
+    while True:
+        payload = {
+            "apikey": api_key,
+            "objectType": "animals",
+            "objectAction": "publicSearch",
+            "search": {
+                "resultStart": start,
+                "resultLimit": page_size,
+                "resultSort": "animalUpdatedDate",
+                "resultOrder": "asc",
+                "fields": SYNC_FIELDS,
+                "filters": filters,
+            }
+        }
+        data = await client.post(payload)
+        # An error must not look like "no more records": that would mark an
+        # empty or partial index as synced
+        if data.get("status") == "error":
+            raise RuntimeError(f"upstream returned an error: {data.get('messages')}")
+        records = list((data.get("data") or {}).values())
+        if not records:
+            break
+
+        page_newest = await asyncio.to_thread(inventory.apply, records)
+        if page_newest and (newest is None or page_newest > newest):
+            newest = page_newest
+        if on_orgs:
+            on_orgs(r.get("animalOrgID") for r in records)
+
+        synced += len(records)
+        start += page_size
+        if len(records) < page_size:
+            break
+
+    await asyncio.to_thread(inventory.finish_sync, newest)
+    print(f"🗂️ Inventory sync: {synced} records applied, watermark {newest}")
+    return synced
+
+
+async def run_sync_loop(inventory, client, api_key, interval=900, on_orgs=None):
+    """Keep the inventory in sync every `interval` seconds."""
+    while True:
+        try:
+            await sync_inventory(inventory, client, api_key, on_orgs=on_orgs)
+        except Exception as e:
+            print(f"⚠️ Inventory sync failed: {e}")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    from rescue_client import RescueClient
+
+    async def main():
+        client = RescueClient(os.getenv("RESCUE_API_URL", "https://api.rescuegroups.org/http/v2.json"), cache=None)
+        try:
+            await sync_inventory(Inventory(), client, os.getenv("API_KEY"))
+        finally:
+            await client.close()
+
+    asyncio.run(main())
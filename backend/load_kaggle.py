@@ -1,136 +1,291 @@
 import pandas as pd
-from kaggle.api.kaggle_api_extended import KaggleApi
-import zipfile, os, glob, schedule, time
-
-api = KaggleApi()
-api.authenticate()
-
-# -------------------- Helper Functions -------------------- #
-
-# Standard: 1 = UNHEALTHY, 0 = healthy/normal
-def normalize_health_from_code(value):
-    """PetFinder style: 1=Healthy, 2=Minor Injury, 3=Serious Injury.
-       We convert to 0=healthy, 1=unhealthy."""
-    if pd.isna(value):
-        return 0
+from normalizers import (
+    normalize_health_from_code, normalize_health_from_binary, normalize_health_from_text, convert_days_to_speed,
+    map_speed_to_status, safe_to_datetime, normalize_type,
+)
+from storage import COMBINED_PATH, EXPORT_CSV, write_frame, read_frame
+from adoption_model import LATEST_POINTER, MODEL_DIR, train_adoption_model
+from canonical import breed_index, color_index
+from paths import DATA_DIR, INSIGHTS_PATH
+import zipfile, os, glob, time, json, hashlib, resource, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# -------------------- Kaggle client -------------------- #
+
+_kaggle_api = None
+
+def set_kaggle_api(client):
+    """Use `client` instead of the real Kaggle API (e.g. a fake for offline benchmarks)."""
+    global _kaggle_api
+    _kaggle_api = client
+
+def kaggle_api():
+    """The Kaggle client, created and authenticated on first use."""
+    global _kaggle_api
+    if _kaggle_api is None:
+        from kaggle.api.kaggle_api_extended import KaggleApi
+        client = KaggleApi()
+        client.authenticate()
+        _kaggle_api = client
+    return _kaggle_api
+
+# -------------------- Stage timing -------------------- #
+# Callables added to STAGE_HOOKS get {"event": "start"|"end", "stage", "source"}
+# as the refresh moves through download/parse/transform/concat/write/...; "end"
+# events also carry wall_s and cpu_s. Nested stages (parse runs inside a
+# source's transform) are reported exclusive of their children.
+
+STAGE_HOOKS = []
+_stage_stacks = threading.local()
+
+@contextmanager
+def stage(name, source=None):
+    if not STAGE_HOOKS:
+        yield
+        return
+    stack = _stage_stacks.__dict__.setdefault("stack", [])
+    if source is None and stack:
+        source = stack[-1]["source"]
+    frame = {"source": source, "child_wall": 0.0, "child_cpu": 0.0}
+    stack.append(frame)
+    for hook in STAGE_HOOKS:
+        hook({"event": "start", "stage": name, "source": source})
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
     try:
-        v = int(value)
-    except:
-        return 0
-    return 1 if v in (2, 3) else 0  # unhealthy if 2 or 3
-
-def normalize_health_from_text(value):
-    """Text intake condition → 1 if unhealthy words detected, else 0."""
-    if pd.isna(value):
-        return 0
-    v = str(value).lower()
-    return 1 if any(t in v for t in ['injur', 'sick', 'ill', 'medical']) else 0
-
-def convert_days_to_speed(days):
-    if pd.isna(days):
-        return 4
-    if days <= 0:  return 0
-    if days <= 7:  return 1
-    if days <= 30: return 2
-    if days <= 90: return 3
-    return 4
-
-def map_speed_to_status(speed):
-    """Binary adoption status from speed bucket."""
-    if pd.isna(speed):
-        return 0
-    return 1 if speed in [0, 1, 2, 3] else 0
-
-def safe_to_datetime(s):
-    return pd.to_datetime(s, errors='coerce')
-
-def normalize_type(series):
-    s = series.astype(str).str.strip().str.lower()
-    return s.replace({'1':'dog', '2':'cat'})
+        yield
+    finally:
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+        stack.pop()
+        if stack:
+            stack[-1]["child_wall"] += wall
+            stack[-1]["child_cpu"] += cpu
+        for hook in STAGE_HOOKS:
+            hook({"event": "end", "stage": name, "source": source,
+                  "wall_s": wall - frame["child_wall"], "cpu_s": cpu - frame["child_cpu"]})
 
 # -------------------- A. Load Core Datasets -------------------- #
 
-def load_core_datasets():
-    print("Loading base datasets...")
-
-    # ---- Dataset 1
-    d1 = 'rabieelkharoua/predict-pet-adoption-status-dataset'
-    api.dataset_download_files(d1, path='.', quiet=True)
-    with zipfile.ZipFile('predict-pet-adoption-status-dataset.zip') as z:
+MANIFEST_PATH = "refresh_manifest.json"
+# Bump when a parser's output changes, so partitions cached by earlier runs
+# are rebuilt even though their archives haven't changed
+PARSER_VERSION = 2
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 5))
+# Sources unchanged on Kaggle are skipped, so frequent refreshes are cheap
+REFRESH_INTERVAL_MINUTES = int(os.getenv("REFRESH_INTERVAL_MINUTES", 60))
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+# -- Bounded-memory CSV reading
+# Loaders only keep the columns they use and stream each CSV in chunks. Kept
+# rows are compacted (repetitive strings → categoricals, ints downcast) and
+# counted against INGEST_MEMORY_BUDGET_MB, which covers the whole ingest:
+# each concurrent source gets an equal share. A source that would go over
+# its share is aborted, and keeps its last good partition.
+MEMORY_BUDGET_MB = int(os.getenv("INGEST_MEMORY_BUDGET_MB", 1024))
+PROBE_ROWS = 1000
+# Parsing + filtering a chunk briefly needs a few times its final size
+CHUNK_OVERHEAD = 4
+# Fraction of a source's share one raw chunk may use while being parsed
+CHUNK_SHARE = 0.25
+# String columns with at most this share of distinct values become categoricals
+CATEGORICAL_MAX_UNIQUE = 0.5
+
+class MemoryBudgetExceeded(Exception):
+    pass
+
+def max_rss_mb():
+    """Peak resident memory of this process so far (ru_maxrss is KB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def source_budget_mb():
+    return MEMORY_BUDGET_MB / max(1, INGEST_WORKERS)
+
+def categorical_columns(chunk):
+    """String columns repetitive enough to store as categoricals."""
+    return [
+        col for col in chunk.columns
+        if (pd.api.types.is_object_dtype(chunk[col]) or pd.api.types.is_string_dtype(chunk[col]))
+        and chunk[col].nunique() <= len(chunk) * CATEGORICAL_MAX_UNIQUE
+    ]
+
+def compact_chunk(chunk, categorical):
+    """Categoricals for the given columns; plain int columns downcast (per
+    chunk, since a later chunk can hold larger values or come back as float)."""
+    dtypes = {col: 'category' for col in categorical}
+    for col in chunk.columns:
+        if col not in dtypes and pd.api.types.is_integer_dtype(chunk[col]) \
+                and not isinstance(chunk[col].dtype, pd.api.extensions.ExtensionDtype):
+            dtypes[col] = pd.to_numeric(chunk[col], downcast='integer').dtype
+    return chunk.astype(dtypes)
+
+def concat_chunks(parts, categorical):
+    """pd.concat that keeps categoricals categorical (it falls back to object
+    when the chunks' categories differ)."""
+    for col in categorical:
+        categories = parts[0][col].cat.categories
+        for part in parts[1:]:
+            categories = categories.union(part[col].cat.categories)
+        dtype = pd.CategoricalDtype(categories)
+        for i, part in enumerate(parts):
+            parts[i] = part.astype({col: dtype})
+    return pd.concat(parts, ignore_index=True)
+
+def read_csv_chunked(f, stats, usecols=None, dtype=None, keep=None, budget_mb=None):
+    """Stream a CSV (path or open zip member) in bounded chunks.
+
+    usecols may be a list or a callable on column names, so optional columns
+    don't fail the read. keep(chunk) -> boolean mask drops unwanted rows (e.g.
+    non-cats) before chunks are accumulated. Raises MemoryBudgetExceeded if
+    the kept rows (plus the final concat, which briefly doubles them) would
+    not fit in budget_mb (default: this source's share of the budget). Row
+    counts and kept bytes go into stats.
+    """
+    budget = (budget_mb or source_budget_mb()) * 1024 * 1024
+    with stage("parse"):
+        reader = pd.read_csv(f, usecols=usecols, dtype=dtype, iterator=True)
+        parts, chunk_rows, kept_bytes, categorical = [], PROBE_ROWS, 0, None
+        try:
+            while True:
+                try:
+                    chunk = reader.get_chunk(chunk_rows)
+                except StopIteration:
+                    break
+                stats["rows_read"] = stats.get("rows_read", 0) + len(chunk)
+                if categorical is None and len(chunk):
+                    # Size the remaining chunks, and pick categoricals, from the first one
+                    bytes_per_row = chunk.memory_usage(deep=True).sum() / len(chunk)
+                    chunk_rows = max(PROBE_ROWS, int(budget * CHUNK_SHARE / (bytes_per_row * CHUNK_OVERHEAD)))
+                    categorical = categorical_columns(chunk)
+                if keep is not None:
+                    chunk = chunk[keep(chunk).fillna(False).astype(bool)]
+                chunk = compact_chunk(chunk, categorical or [])
+                kept_bytes += chunk.memory_usage(deep=True).sum()
+                if 2 * kept_bytes > budget * (1 - CHUNK_SHARE):
+                    raise MemoryBudgetExceeded(
+                        f"kept rows need over {2 * kept_bytes / 1e6:.1f} MB after "
+                        f"{stats['rows_read']} rows read; budget is {budget / 1e6:.1f} MB for this source "
+                        f"(raise INGEST_MEMORY_BUDGET_MB or lower INGEST_WORKERS)"
+                    )
+                parts.append(chunk)
+        finally:
+            reader.close()
+
+        df = concat_chunks(parts, categorical or []) if parts else pd.DataFrame()
+    stats["rows_kept"] = stats.get("rows_kept", 0) + len(df)
+    stats["kept_mb"] = round(stats.get("kept_mb", 0) + float(kept_bytes) / 1e6, 1)
+    return df
+
+def columns_in(*names):
+    wanted = set(names)
+    return lambda c: c in wanted
+
+def is_cat(column):
+    return lambda chunk: normalize_type(chunk[column]) == 'cat'
+
+def parse_dataset1(archive, stats):
+    with zipfile.ZipFile(archive) as z:
         with z.open('pet_adoption_data.csv') as f:
-            df_1 = pd.read_csv(f)
+            df_1 = read_csv_chunked(
+                f, stats,
+                usecols=['PetType','AgeMonths','Breed','HealthCondition','Color','AdoptionLikelihood'],
+                dtype={'PetType': str, 'Breed': str, 'Color': str, 'AgeMonths': float},
+                keep=is_cat('PetType'),
+            )
     df_1_renamed = df_1.rename(columns={
         'PetType':'Type','AgeMonths':'Age','Breed':'Breed',
         'HealthCondition':'Health','AdoptionLikelihood':'Adoption_Status'
     })[['Type','Age','Breed','Health','Color','Adoption_Status']]
-    # Make Health consistent (text or code? assume numeric-like here; flip if needed)
-    df_1_renamed['Health'] = normalize_health_from_code(df_1_renamed['Health'])
-    print(f"Dataset1 rows: {len(df_1_renamed)}")
-    df_1_renamed.to_csv("dataset1_cats.csv", index=False)
-
-    # ---- Dataset 2
-    d2 = 'chaudharisanika/pet-adoption-records-with-animal-and-adopter-data'
-    api.dataset_download_files(d2, path='.', quiet=True)
-    with zipfile.ZipFile('pet-adoption-records-with-animal-and-adopter-data.zip') as z:
+    # HealthCondition is 0 = healthy, 1 = medical condition (not PetFinder's 1/2/3 codes)
+    df_1_renamed['Health'] = normalize_health_from_binary(df_1_renamed['Health'])
+    return df_1_renamed
+
+def parse_dataset2(archive, stats):
+    with zipfile.ZipFile(archive) as z:
         with z.open('pet_adoption_center.csv') as f:
-            df_2 = pd.read_csv(f)
+            df_2 = read_csv_chunked(
+                f, stats,
+                usecols=['species','breed','color','age_years','arrival_date','adoption_date','adopted'],
+                dtype={'species': str, 'breed': str, 'color': str, 'age_years': float, 'adopted': float},
+                keep=is_cat('species'),
+            )
 
     df_2['arrival_date'] = safe_to_datetime(df_2['arrival_date'])
     df_2['adoption_date'] = safe_to_datetime(df_2['adoption_date'])
     df_2['days_until_adoption'] = (df_2['adoption_date'] - df_2['arrival_date']).dt.days
     df_2.loc[df_2['adopted'] == 0, 'days_until_adoption'] = None
-    df_2['AdoptionSpeed'] = df_2['days_until_adoption'].apply(convert_days_to_speed)
+    df_2['AdoptionSpeed'] = convert_days_to_speed(df_2['days_until_adoption'])
     df_2['AgeMonths'] = (df_2['age_years'] * 12).round(0)
-    df_2['Adoption_Status'] = df_2['AdoptionSpeed'].apply(map_speed_to_status)
+    df_2['Adoption_Status'] = map_speed_to_status(df_2['AdoptionSpeed'])
 
     df_2_renamed = df_2.rename(columns={'species':'Type','breed':'Breed','color':'Color'})[
         ['Type','AgeMonths','Color','Breed','Adoption_Status','AdoptionSpeed']
     ].rename(columns={'AgeMonths':'Age'})
     # No explicit health column → fill with 0 (healthy)
     df_2_renamed['Health'] = 0
-    print(f"Dataset2 rows: {len(df_2_renamed)}")
-    df_2_renamed.to_csv("dataset2_cats.csv", index=False)
-
-    # ---- Dataset 3 (PetFinder comp) – optional if local files exist
-    df_3_renamed = pd.DataFrame()
-    try:
-        df_3 = pd.read_csv("data/train.csv")
-        df_3['Adoption_Status'] = df_3['AdoptionSpeed'].apply(map_speed_to_status)
-
-        breed_df = pd.read_csv("data/BreedLabels.csv")
-        df_3 = df_3.merge(breed_df, how='left', left_on='Breed1', right_on='BreedID')
-        df_3.rename(columns={'BreedName':'Breed'}, inplace=True)
-        df_3.drop(['Breed1','BreedID'], axis=1, errors='ignore', inplace=True)
-
-        color_df = pd.read_csv("data/ColorLabels.csv")
-        df_3 = df_3.merge(color_df, how='left', left_on='Color1', right_on='ColorID')
-        df_3.rename(columns={'ColorName':'Color'}, inplace=True)
-        df_3.drop(['ColorID'], axis=1, errors='ignore', inplace=True)
-
-        # Normalize health from PetFinder code
-        df_3['Health'] = df_3['Health'].apply(normalize_health_from_code)
-
-        # Standard columns
-        keep = ['Type','Age','Breed','Color','Health','Adoption_Status','AdoptionSpeed']
-        df_3_renamed = df_3[[c for c in keep if c in df_3.columns]].copy()
-        print(f"Dataset3 rows: {len(df_3_renamed)}")
-        df_3_renamed.to_csv("dataset3_cats.csv", index=False)
-    except FileNotFoundError:
-        print("PetFinder competition files not found in ./data; skipping Dataset 3.")
-
-    # ---- Dataset 4
-    d4 = 'thedevastator/analyzing-adoption-trends-at-the-bloomington-ani'
-    api.dataset_download_files(d4, path='.', quiet=True)
-    with zipfile.ZipFile('analyzing-adoption-trends-at-the-bloomington-ani.zip') as z:
+    return df_2_renamed
+
+def parse_dataset3(archive, stats):
+    """PetFinder competition train.csv (local file, not a Kaggle download)."""
+    df_3 = read_csv_chunked(
+        archive, stats,
+        usecols=['Type','Age','Breed1','Color1','Health','AdoptionSpeed'],
+        keep=is_cat('Type'),
+    )
+    df_3['Adoption_Status'] = map_speed_to_status(df_3['AdoptionSpeed'])
+
+    breed_df = pd.read_csv("data/BreedLabels.csv")
+    df_3 = df_3.merge(breed_df, how='left', left_on='Breed1', right_on='BreedID')
+    df_3.rename(columns={'BreedName':'Breed'}, inplace=True)
+    df_3.drop(['Breed1','BreedID'], axis=1, errors='ignore', inplace=True)
+
+    color_df = pd.read_csv("data/ColorLabels.csv")
+    df_3 = df_3.merge(color_df, how='left', left_on='Color1', right_on='ColorID')
+    df_3.rename(columns={'ColorName':'Color'}, inplace=True)
+    df_3.drop(['ColorID'], axis=1, errors='ignore', inplace=True)
+
+    # Normalize health from PetFinder code
+    df_3['Health'] = normalize_health_from_code(df_3['Health'])
+
+    # Standard columns
+    keep = ['Type','Age','Breed','Color','Health','Adoption_Status','AdoptionSpeed']
+    return df_3[[c for c in keep if c in df_3.columns]].copy()
+
+def parse_dataset4(archive, stats):
+    with zipfile.ZipFile(archive) as z:
         csv_file = [f for f in z.namelist() if f.endswith('.csv')][0]
         with z.open(csv_file) as f:
-            df_4 = pd.read_csv(f)
-
-    df_4 = df_4[df_4['speciesname'].str.lower() == 'cat'].copy()
+            df_4 = read_csv_chunked(
+                f, stats,
+                usecols=columns_in('speciesname','breedname','basecolour','intakereason',
+                                   'returnedreason','intakedate','movementdate'),
+                dtype=str,
+                keep=lambda c: c['speciesname'].str.lower() == 'cat',
+            )
     df_4['intake_date'] = safe_to_datetime(df_4['intakedate'])
     df_4['outcome_date'] = safe_to_datetime(df_4['movementdate'])
     df_4['days_until_outcome'] = (df_4['outcome_date'] - df_4['intake_date']).dt.days
-    df_4['AdoptionSpeed'] = df_4['days_until_outcome'].apply(convert_days_to_speed)
+    df_4['AdoptionSpeed'] = convert_days_to_speed(df_4['days_until_outcome'])
 
     df_4_renamed = df_4.rename(columns={
         'speciesname':'Type',
@@ -144,31 +299,177 @@ def load_core_datasets():
     df_4_renamed = df_4_renamed[[c for c in cols_to_keep if c in df_4_renamed.columns]]
     # No explicit health → 0
     df_4_renamed['Health'] = 0
-    print(f"Dataset4 rows: {len(df_4_renamed)}")
-    df_4_renamed.to_csv("dataset4_cats.csv", index=False)
+    return df_4_renamed
 
-    # ---- Dataset 5
-    d5 = 'jackdaoud/animal-shelter-analytics'
-    api.dataset_download_files(d5, path='.', quiet=True)
-    with zipfile.ZipFile('animal-shelter-analytics.zip') as z:
+def parse_dataset5(archive, stats):
+    with zipfile.ZipFile(archive) as z:
         csv_file = [f for f in z.namelist() if f.endswith('.csv')][0]
         with z.open(csv_file) as f:
-            df_5 = pd.read_csv(f)
-
-    df_5 = df_5[df_5['Animal Type'].str.lower() == 'cat'].copy()
-    df_5['Health'] = df_5['Intake Condition'].apply(normalize_health_from_text)
+            df_5 = read_csv_chunked(
+                f, stats,
+                usecols=columns_in('Animal Type','Breed','Color','Intake Condition','Intake Type'),
+                dtype=str,
+                keep=lambda c: c['Animal Type'].str.lower() == 'cat',
+            )
+    df_5['Health'] = normalize_health_from_text(df_5['Intake Condition'])
     df_5['IntakeReason'] = df_5['Intake Type'].astype(str).str.title()
     df_5_renamed = df_5.rename(columns={'Animal Type':'Type','Breed':'Breed','Color':'Color'})
     cols_to_keep = ['Type','Breed','Color','IntakeReason','Health']
-    df_5_renamed = df_5_renamed[[c for c in cols_to_keep if c in df_5_renamed.columns]]
-    print(f"Dataset5 rows: {len(df_5_renamed)}")
-    df_5_renamed.to_csv("dataset5_cats.csv", index=False)
-
-    # ---- Combine
-    frames = [df_1_renamed, df_2_renamed, df_3_renamed, df_4_renamed, df_5_renamed]
+    return df_5_renamed[[c for c in cols_to_keep if c in df_5_renamed.columns]]
+
+# Each source is independent: (name, Kaggle ref or None for local files, archive, parser)
+CORE_SOURCES = [
+    ("dataset1", 'rabieelkharoua/predict-pet-adoption-status-dataset',
+     'predict-pet-adoption-status-dataset.zip', parse_dataset1),
+    ("dataset2", 'chaudharisanika/pet-adoption-records-with-animal-and-adopter-data',
+     'pet-adoption-records-with-animal-and-adopter-data.zip', parse_dataset2),
+    ("dataset3", None, 'data/train.csv', parse_dataset3),
+    ("dataset4", 'thedevastator/analyzing-adoption-trends-at-the-bloomington-ani',
+     'analyzing-adoption-trends-at-the-bloomington-ani.zip', parse_dataset4),
+    ("dataset5", 'jackdaoud/animal-shelter-analytics',
+     'animal-shelter-analytics.zip', parse_dataset5),
+]
+
+def kaggle_version_info(ref):
+    """Kaggle's current version / last_updated for a dataset ref, or None if
+    it can't be determined (the caller then falls back to archive checksums)."""
+    owner, _, slug = ref.partition('/')
+    try:
+        for d in kaggle_api().dataset_list(search=slug, user=owner) or []:
+            if str(getattr(d, 'ref', '')) == ref:
+                return {
+                    "ref": ref,
+                    "version": getattr(d, 'current_version_number', None) or getattr(d, 'currentVersionNumber', None),
+                    "last_updated": str(getattr(d, 'last_updated', None) or getattr(d, 'lastUpdated', '')),
+                }
+    except Exception as e:
+        print(f"Could not look up Kaggle version for {ref}: {e}")
+    return None
+
+def downloaded_archive(name, expected, since):
+    """Some clients save a download under another name than <slug>.zip: use
+    the newest zip written since `since` that no other source claims."""
+    claimed = {a for _, _, a, _ in CORE_SOURCES}
+    candidates = [f for f in glob.glob("*.zip")
+                  if f not in claimed and os.path.getmtime(f) >= since - 1]
+    if not candidates:
+        return expected
+    found = max(candidates, key=os.path.getmtime)
+    print(f"{name}: {expected} not found after download; using {found}")
+    return found
+
+def ingest_source(name, ref, archive, parse, previous):
+    """Download + parse one source. Returns (frame, manifest entry, changed).
+
+    Work is skipped as early as possible:
+      1. Kaggle reports the same version as last run → no download at all.
+      2. The archive checksum matches last run → no re-parse.
+      3. The parsed frame hashes the same as last run → partition not rewritten.
+    """
+    output = f"{name}_cats.parquet"
+    previous = previous or {}
+    have_output = os.path.exists(output) and previous.get("parser_version") == PARSER_VERSION
+
+    remote = kaggle_version_info(ref) if ref else None
+    if remote and have_output and previous.get("kaggle") == remote:
+        df = read_frame(output)
+        print(f"{name}: unchanged on Kaggle, reusing {output} ({len(df)} rows)")
+        return df, previous, False
+
+    if ref:
+        download_started = time.time()
+        with stage("download", name):
+            kaggle_api().dataset_download_files(ref, path='.', quiet=True)
+        if not os.path.exists(archive):
+            archive = downloaded_archive(name, archive, download_started)
+    if not os.path.exists(archive):
+        if ref is None:
+            print(f"{name}: {archive} not found; skipping.")
+            return pd.DataFrame(), previous, False
+        raise FileNotFoundError(archive)
+
+    checksum = file_sha256(archive)
+    if previous.get("archive_sha256") == checksum and have_output:
+        df = read_frame(output)
+        print(f"{name}: archive unchanged, reusing {output} ({len(df)} rows)")
+        return df, {**previous, "kaggle": remote}, False
+
+    stats = {}
+    started = time.perf_counter()
+    with stage("transform", name):
+        df = parse(archive, stats)
+    seconds = time.perf_counter() - started
+    stats.update({
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(stats.get("rows_read", len(df)) / seconds) if seconds else None,
+        # Process-wide high-water mark; run with INGEST_WORKERS=1 to attribute it to one source
+        "max_rss_mb": round(max_rss_mb(), 1),
+    })
+    print(f"{name}: read {stats.get('rows_read', 0)} rows, kept {len(df)} "
+          f"in {seconds:.2f}s ({stats['rows_per_sec']} rows/s), max RSS {stats['max_rss_mb']} MB")
+
+    frame_hash = dataset_fingerprint(df)
+    changed = not have_output or previous.get("frame_sha256") != frame_hash
+    if changed:
+        with stage("write", name):
+            df = write_frame(df, output)
+        print(f"{name} rows: {len(df)}")
+    else:
+        df = read_frame(output)
+        print(f"{name}: new archive but identical data, keeping {output}")
+
+    return df, {
+        "kaggle": remote,
+        "archive_sha256": checksum,
+        "frame_sha256": frame_hash,
+        "parser_version": PARSER_VERSION,
+        "rows": int(len(df)),
+        "ingest_stats": stats,
+        "output": output,
+        "parsed_at": datetime.now(timezone.utc).isoformat(),
+    }, changed
+
+def ingest_sources(sources, manifest):
+    """Run every source concurrently. Updates manifest in place and returns
+    ({name: frame}, [names whose partition changed])."""
+    frames, changed = {}, []
+
+    # One failing source keeps its last good partition
+    with ThreadPoolExecutor(max_workers=INGEST_WORKERS) as pool:
+        futures = {
+            pool.submit(ingest_source, name, ref, archive, parse, manifest.get(name)): name
+            for name, ref, archive, parse in sources
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                df, entry, was_changed = future.result()
+                if entry:
+                    manifest[name] = entry
+                if was_changed:
+                    changed.append(name)
+            except Exception as e:
+                output = f"{name}_cats.parquet"
+                if os.path.exists(output):
+                    parsed_at = (manifest.get(name) or {}).get("parsed_at", "an unknown time")
+                    print(f"⚠️ {name} failed ({e!r}); using STALE {output} parsed at {parsed_at}")
+                    df = read_frame(output)
+                else:
+                    print(f"⚠️ {name} failed ({e}); skipping.")
+                    df = pd.DataFrame()
+            frames[name] = df
+
+    # Keep the source order stable regardless of completion order
+    return {name: frames[name] for name, *_ in sources}, changed
+
+def combine_frames(frames):
     frames = [f for f in frames if not f.empty]
-    combined = pd.concat(frames, ignore_index=True)
+    with stage("concat", "combined"):
+        combined = pd.concat(frames, ignore_index=True)
+    with stage("transform", "combined"):
+        return standardize_combined(combined)
 
+def standardize_combined(combined):
     # Standardize core cols & dtypes
     for col in ['Type','Age','Breed','Color','Health','Adoption_Status','AdoptionSpeed']:
         if col not in combined.columns:
@@ -178,52 +479,65 @@ def load_core_datasets():
     for col in ['Age','AdoptionSpeed','Adoption_Status','Health']:
         combined[col] = pd.to_numeric(combined[col], errors='coerce')
 
+    # One spelling per breed/color across sources ("DSH", "domestic shorthair", ...)
+    combined['Breed'] = breed_index().canonicalize_series(combined['Breed'])
+    combined['Color'] = color_index().canonicalize_series(combined['Color'])
+
     print("Combined columns:", list(combined.columns))
     return combined
 
 # -------------------- B. Load Latest Kaggle Dataset -------------------- #
 
-def load_latest_kaggle_dataset():
+def latest_kaggle_source():
+    """Source entry for the most recently updated 'cat adoption' dataset, or None."""
     print("\nSearching for latest 'cat adoption' dataset...")
-    datasets = api.dataset_list(search="cat adoption", sort_by="hottest")
+    datasets = kaggle_api().dataset_list(search="cat adoption", sort_by="hottest")
     if not datasets:
         print("No datasets returned for query; skipping latest dataset.")
-        return pd.DataFrame()
+        return None
 
     latest_dataset = max(datasets, key=lambda d: d.last_updated)
     print(f"Found: {latest_dataset.title} ({latest_dataset.ref})")
-    api.dataset_download_files(latest_dataset.ref, path='.', quiet=True)
-
     zip_name = latest_dataset.ref.split('/')[-1] + '.zip'
-    if not os.path.exists(zip_name):
-        # Some clients save as <slug>.zip regardless of ref path
-        candidates = [f for f in os.listdir('.') if f.endswith('.zip')]
-        zip_name = max(candidates, key=os.path.getmtime)
-
-    with zipfile.ZipFile(zip_name, 'r') as zip_ref:
-        zip_ref.extractall('.')
-
-    # Prefer CSVs that look relevant
-    csv_files = [f for f in glob.glob("*.csv") if any(k in f.lower() for k in ['cat','adopt','pet','shelter'])]
-    if not csv_files:
-        csv_files = glob.glob("*.csv")
-
-    print("Detected CSVs:", csv_files)
-    if not csv_files:
-        print("No CSVs found in latest dataset, skipping.")
-        return pd.DataFrame()
-
-    df_new = pd.read_csv(csv_files[0])
-
-    # Map column names where possible
-    colmap = {}
-    for c in df_new.columns:
-        lc = c.lower()
-        if lc in ['type','species']:             colmap[c] = 'Type'
-        elif lc in ['breed','breedname']:        colmap[c] = 'Breed'
-        elif lc in ['age','agemonths','age_months','ageyears','age_years']: colmap[c] = 'Age'
-        elif lc in ['health','intake condition']: colmap[c] = 'Health'
-        elif lc in ['adoption_status','adopted']: colmap[c] = 'Adoption_Status'
+    return ("latest", latest_dataset.ref, zip_name, parse_latest_dataset)
+
+# Header names (lower-cased) the latest dataset may use for each standard column
+LATEST_COLUMNS = {
+    'type': 'Type', 'species': 'Type',
+    'breed': 'Breed', 'breedname': 'Breed',
+    'age': 'Age', 'agemonths': 'Age', 'age_months': 'Age', 'ageyears': 'Age', 'age_years': 'Age',
+    'health': 'Health', 'intake condition': 'Health',
+    'adoption_status': 'Adoption_Status', 'adopted': 'Adoption_Status',
+    'adoptionspeed': 'AdoptionSpeed', 'color': 'Color',
+}
+
+def parse_latest_dataset(archive, stats):
+    with zipfile.ZipFile(archive) as z:
+        # Prefer CSVs that look relevant
+        members = [f for f in z.namelist() if f.lower().endswith('.csv')]
+        csv_files = [f for f in members if any(k in f.lower() for k in ['cat','adopt','pet','shelter'])] or members
+
+        print("Detected CSVs:", csv_files)
+        if not csv_files:
+            print("No CSVs found in latest dataset, skipping.")
+            return pd.DataFrame()
+
+        # Unknown size: only read columns we can map, and drop non-cats per chunk
+        with z.open(csv_files[0]) as f:
+            header = pd.read_csv(f, nrows=0).columns
+        colmap = {}
+        for c in header:
+            std = LATEST_COLUMNS.get(c.lower())
+            if std and std not in colmap.values():
+                colmap[c] = std
+        type_col = next((c for c, std in colmap.items() if std == 'Type'), None)
+
+        with z.open(csv_files[0]) as f:
+            df_new = read_csv_chunked(
+                f, stats,
+                usecols=list(colmap),
+                keep=is_cat(type_col) if type_col else None,
+            )
 
     df_new = df_new.rename(columns=colmap)
     keep = [c for c in ['Type','Age','Breed','Health','Adoption_Status','AdoptionSpeed','Color'] if c in df_new.columns]
@@ -234,11 +548,11 @@ def load_latest_kaggle_dataset():
     if 'Health' in df_new:
         # Try numeric then text
         if pd.api.types.is_numeric_dtype(df_new['Health']):
-            df_new['Health'] = df_new['Health'].apply(normalize_health_from_code)
+            df_new['Health'] = normalize_health_from_code(df_new['Health'])
         else:
-            df_new['Health'] = df_new['Health'].apply(normalize_health_from_text)
+            df_new['Health'] = normalize_health_from_text(df_new['Health'])
 
-    if 'Adoption_Status' in df_new and df_new['Adoption_Status'].dtype != 'int64':
+    if 'Adoption_Status' in df_new and not pd.api.types.is_integer_dtype(df_new['Adoption_Status']):
         # Some datasets use True/False or Y/N
         df_new['Adoption_Status'] = df_new['Adoption_Status'].astype(str).str.lower().map(
             {'1':1,'true':1,'yes':1,'y':1,'0':0,'false':0,'no':0,'n':0}
@@ -247,17 +561,124 @@ def load_latest_kaggle_dataset():
     print("Normalized columns:", df_new.columns.tolist())
     return df_new
 
-# -------------------- Combine Both -------------------- #
+# -------------------- C. Precomputed Insights -------------------- #
+
+AGE_GROUPS = ["Kitten (0–6 mo)", "Young (6–24 mo)", "Adult (2–6 yr)", "Senior (6+ yr)"]
+
+def _top_counts(series, key, n=10):
+    """Count non-empty, non-'unknown' values and keep the n most frequent."""
+    s = series.dropna().astype(str).str.strip()
+    s = s[(s != '') & (s.str.lower() != 'unknown')]
+    counts = s.value_counts().head(n)
+    return [{key: k, "Count": int(v)} for k, v in counts.items()]
+
+def compute_insights(df):
+    """Aggregates behind the Insights dashboard charts."""
+    empty = pd.Series(dtype=object)
+
+    speed = pd.to_numeric(df.get('AdoptionSpeed', empty), errors='coerce').dropna()
+    speed_counts = speed.astype(int).value_counts().sort_index()
+    adoption_speed = [{"AdoptionSpeed": int(k), "Count": int(v)} for k, v in speed_counts.items()]
+
+    # Missing ages count as 0 months, same as the original client-side grouping
+    age = pd.to_numeric(df.get('Age', empty), errors='coerce').reindex(df.index).fillna(0)
+    adopted = pd.to_numeric(df.get('Adoption_Status', empty), errors='coerce').reindex(df.index) == 1
+    groups = pd.cut(age, bins=[-float('inf'), 6, 24, 72, float('inf')], right=False, labels=AGE_GROUPS)
+    adopted_by_group = adopted.groupby(groups, observed=False).sum()
+    age_groups = [{"AgeGroup": g, "Adopted": int(adopted_by_group.get(g, 0))} for g in AGE_GROUPS]
+
+    return {
+        "rows": int(len(df)),
+        "adoption_speed": adoption_speed,
+        "intake_reasons": _top_counts(df.get('IntakeReason', empty), 'IntakeReason'),
+        "age_groups": age_groups,
+        "breeds": _top_counts(df.get('Breed', empty), 'Breed'),
+        "colors": _top_counts(df.get('Color', empty), 'Color'),
+    }
+
+def dataset_fingerprint(df):
+    """Stable content hash of a frame, used to detect when the dataset changed."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update(','.join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+def write_insights(df, path=INSIGHTS_PATH):
+    """Write insights.json for the API, skipping the rebuild if the data is unchanged."""
+    fingerprint = dataset_fingerprint(df)
+    try:
+        with open(path) as f:
+            if json.load(f).get("source_hash") == fingerprint:
+                print("Insights unchanged; keeping", path)
+                return False
+    except (FileNotFoundError, ValueError):
+        pass
+
+    insights = compute_insights(df)
+    insights["source_hash"] = fingerprint
+    insights["generated_at"] = datetime.now(timezone.utc).isoformat()
+
+    # Write to a temp file first so the API never reads a half-written file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(insights, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    print("Insights written to", path)
+    return True
 
-def refresh_all_data():
-    df_base = load_core_datasets()
-    df_latest = load_latest_kaggle_dataset()
-    combined_all = pd.concat([df_base, df_latest], ignore_index=True) if not df_latest.empty else df_base
-    cats_only = combined_all[normalize_type(combined_all['Type']) == 'cat'].copy()
-    cats_only.to_csv("combined_adoption_data_cats.csv", index=False)
-    print("\ncombined_adoption_data_cats.csv updated successfully! Rows:", len(cats_only))
+# -------------------- Combine Both -------------------- #
 
-    # Clean up downloaded zips to keep the folder tidy
+def refresh_all_data(train_model=True):
+    manifest = load_manifest()
+    sources = list(CORE_SOURCES)
+    try:
+        latest = latest_kaggle_source()
+        if latest:
+            sources.append(latest)
+    except Exception as e:
+        print(f"⚠️ Latest dataset lookup failed ({e}); refreshing core datasets only.")
+
+    print("Loading datasets...")
+    frames, changed = ingest_sources(sources, manifest)
+    save_manifest(manifest)
+
+    # Only rebuild the combined output when a partition actually changed
+    if not changed and os.path.exists(COMBINED_PATH):
+        print("\nNo source changed since the last refresh; combined output is up to date.")
+        # ...but still restore derived outputs that are missing (new INSIGHTS_PATH,
+        # a wiped model dir, a training run that failed last time)
+        cats_only = read_frame(COMBINED_PATH)
+        publish_outputs(cats_only, train_model and not has_trained_model())
+        cleanup_archives()
+        return
+    print("\nChanged sources:", changed or "none (combined output missing)")
+
+    combined_all = combine_frames(frames.values())
+    cats_only = combined_all[combined_all['Type'] == 'cat'].copy()
+    with stage("write", "combined"):
+        cats_only = write_frame(cats_only, COMBINED_PATH, export_csv=EXPORT_CSV)
+    print(f"\n{COMBINED_PATH} updated successfully! Rows:", len(cats_only))
+    publish_outputs(cats_only, train_model)
+    cleanup_archives()
+
+def has_trained_model():
+    return os.path.exists(os.path.join(MODEL_DIR, LATEST_POINTER))
+
+def publish_outputs(cats_only, train_model):
+    """insights.json (a no-op when its source hash is unchanged) and, if asked, a new model."""
+    with stage("insights", "combined"):
+        write_insights(cats_only, INSIGHTS_PATH)
+    if train_model:
+        try:
+            with stage("train", "combined"):
+                train_adoption_model(cats_only)
+        except Exception as e:
+            print(f"⚠️ Adoption model training failed; keeping the previous model: {e}")
+
+def cleanup_archives():
+    """Clean up downloaded zips to keep the folder tidy (the manifest keeps
+    what we need to know whether to download them again)."""
     for f in glob.glob("*.zip"):
         try:
             os.remove(f)
@@ -267,9 +688,11 @@ def refresh_all_data():
 # -------------------- Scheduler -------------------- #
 
 if __name__ == "__main__":
+    import schedule
+
     refresh_all_data()
-    schedule.every().monday.at("10:00").do(refresh_all_data)
-    print("Auto-refresh scheduled every Monday at 10:00 AM...")
+    schedule.every(REFRESH_INTERVAL_MINUTES).minutes.do(refresh_all_data)
+    print(f"Auto-refresh scheduled every {REFRESH_INTERVAL_MINUTES} minutes...")
     while True:
         schedule.run_pending()
         time.sleep(60)
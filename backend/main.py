@@ -1,24 +1,259 @@
-from flask import Flask, request, jsonify, send_from_directory
-from flask_cors import CORS
-import requests
+from contextlib import asynccontextmanager, suppress
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+import asyncio
+import httpx
 import json
-import html
 import os
 
-app = Flask(__name__)
-CORS(app)
+from adoption_model import ModelService, ModelUnavailable, AdoptionSpeedStage
+from cache import cache_from_env, search_key, animal_key
+from canonical import breed_index, color_index
+from geo import GeoUnavailable, MAX_RADIUS_MILES, ShelterGeoIndex
+from metrics import MetricsMiddleware, debug_sampled, render_metrics, span
+from org_directory import OrgDirectory, ORG_FIELDS
+from paths import INSIGHTS_PATH
+from prefetch import Prefetcher
+from records import PAGE_FIELDS, DETAIL_FIELDS, format_cat, format_cat_details, shelter_info
+from rescue_client import UpstreamError, client_from_env
 
-RESCUE_API_URL = "https://api.rescuegroups.org/http/v2.json"
+RESCUE_API_URL = os.getenv("RESCUE_API_URL", "https://api.rescuegroups.org/http/v2.json")
 API_KEY = os.getenv("API_KEY")
 
-# 🐾 Search cats by city/state
-@app.route("/api/search_cats", methods=["GET"])
-def search_cats():
-    city = request.args.get("city", "").strip()
-    state = request.args.get("state", "").strip().upper()
-    limit = int(request.args.get("limit", 9))
-    page = int(request.args.get("page", 1))
+# insights.json is written by load_kaggle.refresh_all_data(); keep the last
+# loaded copy in memory and only re-read it when the file changes on disk.
+_insights = {"mtime": None, "body": None, "etag": None, "last_modified": None}
+
+# Shared RescueGroups response cache (see cache.py for CACHE_* settings)
+response_cache = cache_from_env()
+
+# Pooled keep-alive client with timeouts and request coalescing (see rescue_client.py)
+rescue = client_from_env(RESCUE_API_URL, response_cache)
+
+# 🔮 Next-page and detail warming; PREFETCH_CONCURRENCY=0 disables page prefetch
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", 2))
+prefetcher = Prefetcher(response_cache, max_concurrency=max(PREFETCH_CONCURRENCY, 1))
+
+
+async def fetch_orgs(org_ids):
+    """Look up many orgs with a single multi-ID orgs search."""
+    payload = {
+        "apikey": API_KEY,
+        "objectType": "orgs",
+        "objectAction": "publicSearch",
+        "search": {
+            "resultStart": 0,
+            "resultLimit": len(org_ids),
+            "fields": ORG_FIELDS,
+            "filters": [
+                {"fieldName": "orgID", "operation": "equals", "criteria": list(org_ids)}
+            ]
+        }
+    }
+    data = await rescue.fetch(payload, search_key(payload))
+    records = data.get("data") or {}
+    return {str(r.get("orgID") or org_id): r for org_id, r in records.items()}
+
+
+# 🏠 Shelter records, kept on disk and warmed in bulk from search results
+org_directory = OrgDirectory(fetch_orgs)
+# 📍 Shelters located by postal code, for lat/lon radius search
+shelter_geo = ShelterGeoIndex(org_directory)
+# Upstream fallback only: how many of the nearest shelters to filter on
+NEAR_MAX_ORGS = 100
+
+# 🗂️ Local index of available cats, synced incrementally in the background.
+# Opened by run_inventory() after startup (SQLAlchemy alone takes ~200 ms to
+# import); until then searches go to upstream.
+inventory = None
+INVENTORY_SYNC_INTERVAL = int(os.getenv("INVENTORY_SYNC_INTERVAL", 900))  # 0 disables syncing
+
+
+# 🧠 Adoption-likelihood model, loaded once and hot-swapped when retrained
+model_service = ModelService()
+# Predicted AdoptionSpeed on search results, skipped if it would exceed PREDICT_BUDGET_MS
+score_adoption_speed = AdoptionSpeedStage(model_service, budget_ms=int(os.getenv("PREDICT_BUDGET_MS", 50)))
+
+
+def warm_up():
+    """First-use work kept off the startup path: unpickling the model pulls in
+    numpy/scipy/scikit-learn, and the label indexes read their CSVs. Until it
+    finishes, predictions are skipped (search) or 503 (/api/predict)."""
+    try:
+        model_service.load()
+    except Exception as e:
+        print(f"⚠️ Could not load adoption model: {e}")
+    breed_index()
+    color_index()
+
+
+def inventory_ready():
+    return inventory is not None and inventory.is_ready()
+
+
+def open_inventory():
+    from inventory import Inventory
+    return Inventory()
+
+
+async def run_inventory():
+    """Open the inventory off the event loop (import included), then keep it in sync."""
+    global inventory
+    try:
+        inventory = await asyncio.to_thread(open_inventory)
+    except Exception as e:
+        print(f"⚠️ Could not open inventory: {e}")
+        return
+    if INVENTORY_SYNC_INTERVAL > 0:
+        from inventory import run_sync_loop
+        await run_sync_loop(inventory, rescue, API_KEY, INVENTORY_SYNC_INTERVAL, on_orgs=org_directory.warm_async)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await rescue.start()
+    warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    org_directory.warm_async(org_directory.stale_ids())
+    inventory_task = asyncio.create_task(run_inventory())
+    yield
+    warm_up_task.cancel()
+    inventory_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await inventory_task
+    await org_directory.flush()
+    await rescue.close()
+    await response_cache.close()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+# ⏱️ Per-route latency histograms and Server-Timing spans (see /metrics)
+app.add_middleware(MetricsMiddleware)
+
+
+def upstream_error(e):
+    if isinstance(e, httpx.TimeoutException):
+        print(f"⏱️ Upstream timeout: {e!r}")
+        return JSONResponse({"error": "Upstream timeout"}, status_code=504)
+    if isinstance(e, UpstreamError):
+        print(f"❌ Upstream error: {e}")
+        return JSONResponse({"error": "Upstream error"}, status_code=502)
+    print(f"❌ Error: {e}")
+    return JSONResponse({"error": "Internal server error"}, status_code=500)
+
+
+def timed_json(body):
+    """JSONResponse with the body's serialization recorded as a span."""
+    with span("serialize"):
+        return JSONResponse(body)
+
+
+def search_payload(filters, result_start, limit):
+    return {
+        "apikey": API_KEY,
+        "objectType": "animals",
+        "objectAction": "publicSearch",
+        "search": {
+            "resultStart": result_start,
+            "resultLimit": limit,
+            "fields": PAGE_FIELDS,
+            "filters": filters
+        }
+    }
+
+
+async def prefetch_page(payload):
+    """Fetch a search page into the cache in the background, warming its details too."""
+    async def fetch():
+        data = await rescue.search(payload, key)
+        await prefetcher.warm_details(data.get("data") or {})
+        org_directory.warm_async(r.get("animalOrgID") for r in (data.get("data") or {}).values())
+
+    key = search_key(payload)
+    await prefetcher.schedule_page(key, fetch)
+
+
+# 📍 Cats at shelters within radius_miles of lat/lon, nearest first
+async def search_near(lat, lon, radius_miles, limit, page):
+    if lat is None or lon is None or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return JSONResponse({"error": "lat and lon are both required"}, status_code=400)
+    if not 0 < radius_miles <= MAX_RADIUS_MILES:
+        return JSONResponse({"error": f"radius_miles must be in (0, {MAX_RADIUS_MILES}]"}, status_code=400)
+
+    try:
+        nearby = await asyncio.to_thread(shelter_geo.nearby, lat, lon, radius_miles)
+    except GeoUnavailable as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+    if not nearby:
+        return {"cats": [], "has_more": False, "total": 0}
+
     result_start = (page - 1) * limit
+    if inventory_ready():
+        try:
+            with span("inventory"):
+                cats, total = await asyncio.to_thread(inventory.search_near, nearby, limit, page)
+            with span("predict"):
+                cats = await score_adoption_speed(cats)
+            return timed_json({"cats": cats, "has_more": result_start + len(cats) < total, "total": total,
+                               "sorted": "distance"})
+        except Exception as e:
+            print(f"⚠️ Inventory radius search failed, falling back to upstream: {e}")
+
+    # Upstream can't sort by distance, so filter on the nearest shelters and
+    # order each page locally; "sorted": "page" tells clients that ordering
+    # doesn't carry across pages
+    org_ids = list(nearby)[:NEAR_MAX_ORGS]
+    filters = [
+        {"fieldName": "animalSpecies", "operation": "equals", "criteria": "Cat"},
+        {"fieldName": "animalStatus", "operation": "equals", "criteria": "Available"},
+        {"fieldName": "animalOrgID", "operation": "equals", "criteria": org_ids},
+    ]
+    payload = search_payload(filters, result_start, limit)
+    try:
+        data = await rescue.search(payload, search_key(payload))
+        records = data.get("data") or {}
+        await prefetcher.warm_details(records)
+        with span("map"):
+            cats = []
+            for record in records.values():
+                cat = format_cat(record)
+                cat["distance_miles"] = round(nearby.get(str(record.get("animalOrgID")), radius_miles), 1)
+                cats.append(cat)
+            cats.sort(key=lambda c: c["distance_miles"])
+        with span("predict"):
+            cats = await score_adoption_speed(cats)
+        return timed_json({"cats": cats, "has_more": len(cats) >= limit, "sorted": "page"})
+    except Exception as e:
+        return upstream_error(e)
+
+
+# 🐾 Search cats by city/state, or by lat/lon/radius_miles
+MAX_PAGE_SIZE = 100
+
+
+@app.get("/api/search_cats")
+async def search_cats(city: str = "", state: str = "",
+                      limit: int = Query(9, ge=1, le=MAX_PAGE_SIZE), page: int = Query(1, ge=1),
+                      lat: float = None, lon: float = None, radius_miles: float = 25):
+    if lat is not None or lon is not None:
+        return await search_near(lat, lon, radius_miles, limit, page)
+
+    city = city.strip()
+    state = state.strip().upper()
+    result_start = (page - 1) * limit
+
+    # 🗂️ Answer from the local inventory once it has completed a sync
+    if inventory_ready():
+        try:
+            with span("inventory"):
+                cats, total = await asyncio.to_thread(inventory.search, city, state, limit, page)
+            with span("predict"):
+                cats = await score_adoption_speed(cats)
+            return timed_json({"cats": cats, "has_more": result_start + len(cats) < total, "total": total})
+        except Exception as e:
+            print(f"⚠️ Inventory search failed, falling back to upstream: {e}")
 
     filters = [
         {"fieldName": "animalSpecies", "operation": "equals", "criteria": "Cat"},
@@ -45,80 +280,45 @@ def search_cats():
             "criteria": state
         })
 
-    payload = {
-        "apikey": API_KEY,
-        "objectType": "animals",
-        "objectAction": "publicSearch",
-        "search": {
-            "resultStart": result_start,
-            "resultLimit": limit,
-            "fields": [
-                "animalID",
-                "animalName",
-                "animalBreed",
-                "animalColor",
-                "animalSex",
-                "animalLocationCitystate",
-                "animalPictures",
-                "animalDescriptionPlain",
-                "animalAvailableDate",
-                "animalUpdatedDate"
-            ],
-            "filters": filters
-        }
-    }
+    payload = search_payload(filters, result_start, limit)
+    key = search_key(payload)
 
-    print("📤 Sending search payload:")
-    print(json.dumps(payload, indent=2))
+    if debug_sampled():
+        print(f"📤 Search payload: {json.dumps(payload)}")
 
     try:
-        res = requests.post(RESCUE_API_URL, json=payload)
-        data = res.json()
+        await prefetcher.mark_used(key)
+        data = await rescue.search(payload, key)
 
         if not data.get("data"):
-            return jsonify({"cats": [], "has_more": False})
-
-        cats = []
-        for record in data["data"].values():
-            pictures = record.get("animalPictures")
-            image_url = None
-            if isinstance(pictures, list) and len(pictures) > 0:
-                image_url = pictures[0].get("urlSecureFullsize") or pictures[0].get("urlInsecureFullsize")
-
-            cats.append({
-                "id": record.get("animalID"),
-                "name": record.get("animalName"),
-                "breed": record.get("animalBreed"),
-                "color": record.get("animalColor"),
-                "sex": record.get("animalSex"),
-                "image": image_url,
-                "description": html.unescape(record.get("animalDescriptionPlain") or ""),
-                "location": record.get("animalLocationCitystate"),
-                "animalAvailableDate": record.get("animalAvailableDate"),
-                "animalUpdatedDate": record.get("animalUpdatedDate")
-            })
-
-        # 🐾 Debug print in terminal for date fields
-        print("\n📅 Cats with Available or Updated Dates:")
-        for c in cats:
-            if c.get("animalAvailableDate") or c.get("animalUpdatedDate"):
-                print(f" - {c.get('name', 'Unnamed')} | "
-                      f"Available: {c.get('animalAvailableDate', 'N/A')} | "
-                      f"Updated: {c.get('animalUpdatedDate', 'N/A')}")
-        print("🔹 Total cats with date info:", 
-              len([c for c in cats if c.get('animalAvailableDate') or c.get('animalUpdatedDate')]))
-        print("🔹 Total cats returned:", len(cats), "\n")
+            return {"cats": [], "has_more": False}
+
+        with span("map"):
+            cats = [format_cat(record) for record in data["data"].values()]
+        with span("predict"):
+            cats = await score_adoption_speed(cats)
+
+        # Warm shelter records in the background so detail views skip the org lookup
+        org_directory.warm_async(r.get("animalOrgID") for r in data["data"].values())
+
+        # 🔮 Seed detail entries from this page and fetch the next one ahead of the click
+        await prefetcher.warm_details(data["data"])
+        if len(cats) >= limit and PREFETCH_CONCURRENCY > 0:
+            await prefetch_page(search_payload(filters, result_start + limit, limit))
+
+        if debug_sampled():
+            dated = [c for c in cats if c.get("animalAvailableDate") or c.get("animalUpdatedDate")]
+            print(f"📅 {len(dated)} of {len(cats)} cats have Available/Updated dates")
 
         has_more = len(cats) >= limit
-        return jsonify({"cats": cats, "has_more": has_more})
+        return timed_json({"cats": cats, "has_more": has_more})
 
     except Exception as e:
-        print(f"❌ Error: {e}")
-        return jsonify({"error": "Internal server error"}), 500
+        return upstream_error(e)
 
 
-@app.route("/api/cat/<cat_id>", methods=["GET"])
-def get_cat_details(cat_id):
+@app.get("/api/cat/{cat_id}")
+async def get_cat_details(cat_id: str):
     # Step 1️⃣: Fetch cat details
     cat_payload = {
         "apikey": API_KEY,
@@ -127,15 +327,7 @@ def get_cat_details(cat_id):
         "search": {
             "resultStart": 0,
             "resultLimit": 1,
-            "fields": [
-                "animalID", "animalName", "animalBreed", "animalColor",
-                "animalSex", "animalAgeString", "animalEnergyLevel",
-                "animalOKWithCats", "animalOKWithDogs", "animalOKWithKids",
-                "animalDescriptionPlain", "animalLocationCitystate",
-                "animalMicrochipped", "animalAltered", "animalSpecialneeds",
-                "animalSpecialneedsDescription", "animalOrgID", "animalOrgName",
-                "animalPictures", "animalUrl"
-            ],
+            "fields": DETAIL_FIELDS,
             "filters": [
                 {"fieldName": "animalID", "operation": "equals", "criteria": cat_id}
             ]
@@ -143,88 +335,179 @@ def get_cat_details(cat_id):
     }
 
     try:
-        cat_res = requests.post(RESCUE_API_URL, json=cat_payload)
-        cat_data = cat_res.json()
+        await prefetcher.mark_used(animal_key(cat_id))
+        cat_data = await rescue.search(cat_payload, animal_key(cat_id))
 
         if not cat_data.get("data"):
-            return jsonify({"error": "Cat not found"}), 404
+            return JSONResponse({"error": "Cat not found"}, status_code=404)
 
         record = list(cat_data["data"].values())[0]
         org_id = record.get("animalOrgID")
 
         # 🐱 Format cat info
-        pictures = record.get("animalPictures")
-        image_url = None
-        if isinstance(pictures, list) and len(pictures) > 0:
-            image_url = pictures[0].get("urlSecureFullsize") or pictures[0].get("urlInsecureFullsize")
-
-        cat_details = {
-            "id": record.get("animalID"),
-            "name": record.get("animalName"),
-            "breed": record.get("animalBreed"),
-            "color": record.get("animalColor"),
-            "sex": record.get("animalSex"),
-            "age": record.get("animalAgeString"),
-            "energy_level": record.get("animalEnergyLevel"),
-            "ok_with_cats": record.get("animalOKWithCats"),
-            "ok_with_dogs": record.get("animalOKWithDogs"),
-            "ok_with_kids": record.get("animalOKWithKids"),
-            "microchipped": record.get("animalMicrochipped"),
-            "altered": record.get("animalAltered"),
-            "special_needs": record.get("animalSpecialneeds"),
-            "special_needs_desc": record.get("animalSpecialneedsDescription"),
-            "description": html.unescape(record.get("animalDescriptionPlain") or ""),
-            "location": record.get("animalLocationCitystate"),
-            "link": record.get("animalUrl"),
-            "image": image_url,
-            "shelter": {"name": record.get("animalOrgName", "Unknown Shelter")}
-        }
+        with span("map"):
+            cat_details = format_cat_details(record)
 
-        # Step 2️⃣: Fetch shelter info (if org_id exists)
+        # Step 2️⃣: Shelter info from the org directory (upstream only on a miss)
         if org_id:
-            org_payload = {
+            org_record = await org_directory.get_or_fetch(org_id)
+            if org_record:
+                cat_details["shelter"].update(shelter_info(org_record))
+
+        return timed_json(cat_details)
+
+    except Exception as e:
+        return upstream_error(e)
+
+
+MAX_BULK_IDS = 100
+
+
+# 🐱🐱 Details for many cats (favorites, comparisons) in one round trip
+@app.get("/api/cats")
+async def get_cats_bulk(ids: str = ""):
+    cat_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not cat_ids:
+        return JSONResponse({"error": "Expected ?ids=<id>,<id>,..."}, status_code=400)
+    if len(cat_ids) > MAX_BULK_IDS:
+        return JSONResponse({"error": f"At most {MAX_BULK_IDS} ids per request"}, status_code=400)
+
+    # Step 1️⃣: Per-cat cache first (same entries /api/cat/<id> uses)
+    records, missing = {}, []
+    keys = [animal_key(cat_id) for cat_id in cat_ids]
+    for key in keys:
+        await prefetcher.mark_used(key)
+    for cat_id, (cached, state) in zip(cat_ids, await response_cache.get_many(keys)):
+        if state == "fresh" and cached.get("data"):
+            records[cat_id] = list(cached["data"].values())[0]
+        else:
+            missing.append(cat_id)
+
+    try:
+        # Step 2️⃣: Every miss in a single multi-ID animals search
+        if missing:
+            payload = {
                 "apikey": API_KEY,
-                "objectType": "orgs",
+                "objectType": "animals",
                 "objectAction": "publicSearch",
                 "search": {
                     "resultStart": 0,
-                    "resultLimit": 1,
-                    "fields": [
-                        "orgName", "orgLocationCity", "orgLocationState",
-                        "orgLocationPostalcode", "orgPhone", "orgEmail", "orgUrl"
-                    ],
+                    "resultLimit": len(missing),
+                    "fields": DETAIL_FIELDS,
                     "filters": [
-                        {"fieldName": "orgID", "operation": "equals", "criteria": org_id}
+                        {"fieldName": "animalID", "operation": "equals", "criteria": missing}
                     ]
                 }
             }
+            data = await rescue.fetch(payload, search_key(payload))
+            for animal_id, record in (data.get("data") or {}).items():
+                animal_id = str(record.get("animalID") or animal_id)
+                records[animal_id] = record
+                await response_cache.set(animal_key(animal_id),
+                                         {"status": "ok", "foundRows": 1, "data": {animal_id: record}})
 
-            org_res = requests.post(RESCUE_API_URL, json=org_payload)
-            org_data = org_res.json()
+        # Step 3️⃣: Each distinct shelter once, uncached ones in one orgs search
+        await org_directory.warm(r.get("animalOrgID") for r in records.values())
 
-            if org_data.get("data"):
-                org_record = list(org_data["data"].values())[0]
-                cat_details["shelter"].update({
-                    "city": org_record.get("orgLocationCity"),
-                    "state": org_record.get("orgLocationState"),
-                    "zip": org_record.get("orgLocationPostalcode"),
-                    "phone": org_record.get("orgPhone"),
-                    "email": org_record.get("orgEmail"),
-                    "website": org_record.get("orgUrl")
-                })
+        with span("map"):
+            cats = []
+            for cat_id in cat_ids:
+                record = records.get(cat_id)
+                if record is None:
+                    continue
+                cat_details = format_cat_details(record)
+                org_record = org_directory.get(record.get("animalOrgID")) if record.get("animalOrgID") else None
+                if org_record:
+                    cat_details["shelter"].update(shelter_info(org_record))
+                cats.append(cat_details)
 
-        return jsonify(cat_details)
+        return timed_json({"cats": cats, "not_found": [i for i in cat_ids if i not in records]})
 
     except Exception as e:
-        print(f"❌ Error: {e}")
-        return jsonify({"error": "Internal server error"}), 500
+        return upstream_error(e)
+
+
+# 🧠 Score a batch of cats, e.g. a whole search_cats page, in one call
+@app.post("/api/predict")
+async def predict(body: dict):
+    cats = body.get("cats")
+    if not isinstance(cats, list) or not all(isinstance(c, dict) for c in cats):
+        return JSONResponse({"error": "Expected {\"cats\": [...]}"}, status_code=400)
+
+    try:
+        scores = await asyncio.to_thread(model_service.predict_likelihood, cats)
+    except ModelUnavailable as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+
+    return {
+        "model_version": model_service.version,
+        "predictions": [
+            {"id": c.get("id"), "adoption_likelihood": round(p, 4)} for c, p in zip(cats, scores)
+        ],
+    }
+
+
+def load_insights():
+    mtime = os.path.getmtime(INSIGHTS_PATH)
+    if _insights["mtime"] != mtime:
+        with open(INSIGHTS_PATH, "rb") as f:
+            body = f.read()
+        source_hash = json.loads(body).get("source_hash") or str(mtime)
+        _insights.update({
+            "mtime": mtime,
+            "body": body,
+            "etag": f'"{source_hash[:32]}"',
+            "last_modified": formatdate(mtime, usegmt=True),
+        })
+    return _insights
+
+
+def insights_not_modified(request, insights):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        return insights["etag"] in [t.strip() for t in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(insights["mtime"]) <= since
+    return False
+
+
+# 📊 Precomputed Insights dashboard aggregates
+@app.get("/api/insights")
+async def get_insights(request: Request):
+    try:
+        insights = load_insights()
+    except FileNotFoundError:
+        return JSONResponse({"error": "Insights not generated yet"}, status_code=503)
+
+    headers = {
+        "ETag": insights["etag"],
+        "Last-Modified": insights["last_modified"],
+        "Cache-Control": "public, no-cache",
+    }
+    if insights_not_modified(request, insights):
+        return Response(status_code=304, headers=headers)
+    return Response(insights["body"], media_type="application/json", headers=headers)
+
+
+@app.get("/api/cache_stats")
+async def cache_stats():
+    return {**(await response_cache.stats()), **rescue.stats(), "orgs": len(org_directory),
+            "inventory_ready": inventory_ready(), "adoption_speed": score_adoption_speed.counters,
+            "prefetch": prefetcher.stats()}
 
 
-@app.route("/data/<path:filename>")
-def serve_data(filename):
-    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
-    return send_from_directory(data_dir, filename)
+# 📈 Prometheus scrape endpoint
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
-    app.run(port=5050, debug=True)
+    import uvicorn
+    uvicorn.run("main:app", port=5050, reload=True)
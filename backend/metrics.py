@@ -0,0 +1,179 @@
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# LOG_LEVEL=debug turns on per-request logs and debug dumps for a
+# LOG_SAMPLE_RATE fraction of requests
+LOG_LEVEL = os.getenv("LOG_LEVEL", "info").lower()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 0.01))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Per-request span timings: {span name: seconds}. Tasks spawned during the
+# request (e.g. the upstream call) share the same dict.
+_spans = ContextVar("spans", default=None)
+_sampled = ContextVar("sampled", default=False)
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += seconds
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for labels, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram("purrmatch_request_seconds", "API request latency by route.", ("route", "method"))
+REQUESTS = Counter("purrmatch_requests_total", "API requests by route and status.", ("route", "method", "status"))
+SPAN_SECONDS = Histogram("purrmatch_span_seconds", "Time spent in each stage of a request.", ("route", "span"))
+UPSTREAM_SECONDS = Histogram(
+    "purrmatch_upstream_seconds", "RescueGroups call latency by objectType and phase.", ("object_type", "phase")
+)
+UPSTREAM_ERRORS = Counter("purrmatch_upstream_errors_total", "Failed RescueGroups calls.", ("object_type",))
+
+REGISTRY = [REQUEST_SECONDS, REQUESTS, SPAN_SECONDS, UPSTREAM_SECONDS, UPSTREAM_ERRORS]
+
+
+def render_metrics():
+    """Everything in REGISTRY in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# -------------------- Spans -------------------- #
+
+def record_span(name, seconds):
+    spans = _spans.get()
+    if spans is not None:
+        spans[name] = spans.get(name, 0.0) + seconds
+
+
+@contextmanager
+def span(name):
+    """Time a block as part of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+def detach_request():
+    """Call at the top of a background task so its work isn't attributed to
+    the request that happened to spawn it."""
+    _spans.set(None)
+    _sampled.set(False)
+
+
+def debug_sampled():
+    """True if this request was picked for debug logging."""
+    return _sampled.get()
+
+
+class MetricsMiddleware:
+    """ASGI middleware: times each request, feeds the route and span
+    histograms, and reports the spans in a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans = {}
+        spans_token = _spans.set(spans)
+        sampled_token = _sampled.set(LOG_LEVEL == "debug" and random.random() < LOG_SAMPLE_RATE)
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                timing = ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in spans.items())
+                if timing:
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            # Route template, not the raw path, to keep label cardinality bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            REQUEST_SECONDS.observe(elapsed, route, method)
+            REQUESTS.inc(route, method, str(status[0]))
+            for name, seconds in spans.items():
+                SPAN_SECONDS.observe(seconds, route, name)
+            if _sampled.get():
+                print(json.dumps({
+                    "route": route, "method": method, "status": status[0], "ms": round(elapsed * 1000, 2),
+                    "spans": {name: round(seconds * 1000, 2) for name, seconds in spans.items()},
+                }))
+            _spans.reset(spans_token)
+            _sampled.reset(sampled_token)
@@ -0,0 +1,53 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Vectorized column normalizers shared by the ingestion pipeline.
+# Each takes a whole Series and returns a Series aligned to its index.
+
+# Standard: 1 = UNHEALTHY, 0 = healthy/normal
+UNHEALTHY_PATTERN = re.compile(r'injur|sick|ill|medical', re.IGNORECASE)
+
+# AdoptionSpeed buckets: upper bound (days, inclusive) → bucket; anything later or unknown is 4
+SPEED_BINS = [0, 7, 30, 90]
+
+def normalize_health_from_code(series):
+    """PetFinder style: 1=Healthy, 2=Minor Injury, 3=Serious Injury.
+       We convert to 0=healthy, 1=unhealthy (missing/non-numeric → 0)."""
+    codes = np.trunc(pd.to_numeric(series, errors='coerce'))
+    return codes.isin([2, 3]).astype('int64')
+
+def normalize_health_from_binary(series):
+    """0=healthy, 1=medical condition (already the standard; missing/other → 0)."""
+    return pd.to_numeric(series, errors='coerce').eq(1).astype('int64')
+
+def normalize_health_from_text(series):
+    """Text intake condition → 1 if unhealthy words detected, else 0."""
+    text = series.astype('string')
+    return text.str.contains(UNHEALTHY_PATTERN, na=False).astype('int64')
+
+def convert_days_to_speed(days):
+    """Days until adoption → AdoptionSpeed bucket 0–4 (missing → 4)."""
+    d = pd.to_numeric(days, errors='coerce')
+    # Plain float64 so nullable (Int64/Float64) input compares to NaN, not pd.NA
+    values = d.to_numpy(dtype='float64', na_value=np.nan)
+    conditions = [values <= bound for bound in SPEED_BINS]
+    speed = np.select(conditions, list(range(len(SPEED_BINS))), default=len(SPEED_BINS))
+    return pd.Series(speed, index=d.index, dtype='int64')
+
+def map_speed_to_status(speed):
+    """Binary adoption status from speed bucket."""
+    s = pd.to_numeric(speed, errors='coerce')
+    values = s.to_numpy(dtype='float64', na_value=np.nan)
+    return pd.Series(np.isin(values, [0, 1, 2, 3]), index=s.index).astype('int64')
+
+def safe_to_datetime(s):
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        # to_datetime would keep it categorical, which can't be subtracted
+        s = s.astype(object)
+    return pd.to_datetime(s, errors='coerce')
+
+def normalize_type(series):
+    s = series.astype(str).str.strip().str.lower()
+    return s.replace({'1':'dog', '2':'cat'})
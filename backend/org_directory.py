@@ -0,0 +1,172 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+
+from metrics import detach_request
+from paths import STATE_DIR
+
+ORG_DIRECTORY_PATH = os.path.join(STATE_DIR, "org_directory.json")
+
+ORG_FIELDS = [
+    "orgID", "orgName", "orgLocationCity", "orgLocationState",
+    "orgLocationPostalcode", "orgPhone", "orgEmail", "orgUrl"
+]
+
+
+class OrgDirectory:
+    """Long-lived store of shelter/org records, persisted to disk.
+
+    Org details rarely change, so records are kept for `ttl` seconds (a week
+    by default) and warmed in bulk: `fetch_orgs(ids)` is a coroutine expected
+    to look up many org IDs with a single upstream search and return
+    {org_id: record}.
+    """
+
+    def __init__(self, fetch_orgs, path=ORG_DIRECTORY_PATH, ttl=7 * 24 * 3600, batch_size=100):
+        self.fetch_orgs = fetch_orgs
+        self.path = path
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self._orgs = {}
+        self.version = 0  # bumped whenever records change, for derived indexes
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._save_task = None
+        self._warming = set()
+        self._tasks = set()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                self._orgs = json.load(f)
+            self.version += 1
+            print(f"🏠 Loaded {len(self._orgs)} orgs from {self.path}")
+        except FileNotFoundError:
+            self._orgs = {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read org directory {self.path}, starting empty: {e}")
+            self._orgs = {}
+
+    def save(self):
+        """Atomically write the directory to disk. Concurrent saves are
+        serialized and each writes its own temp file."""
+        with self._save_lock:
+            with self._lock:
+                snapshot = dict(self._orgs)
+                self._dirty = False
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".org_directory-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+    def save_soon(self):
+        """Save in the background. Warms that land while a save is running
+        are folded into one follow-up write instead of one write each, and
+        disk errors are logged rather than failing the request that warmed."""
+        self._dirty = True
+        if self._save_task is not None and not self._save_task.done():
+            return
+
+        async def run():
+            detach_request()
+            try:
+                while self._dirty:
+                    await asyncio.to_thread(self.save)
+            except Exception as e:
+                print(f"⚠️ Could not save org directory to {self.path}: {e}")
+
+        self._save_task = asyncio.get_running_loop().create_task(run())
+
+    async def flush(self):
+        """Wait for a pending background save (e.g. at shutdown)."""
+        if self._save_task is not None:
+            await self._save_task
+
+    def _is_fresh(self, entry):
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def get(self, org_id):
+        """Cached record for org_id, or None. Stale records are still returned
+        (org details rarely change) and refreshed in the background."""
+        entry = self._orgs.get(str(org_id))
+        if entry is None:
+            return None
+        if not self._is_fresh(entry):
+            self.warm_async([org_id])
+        return entry["record"]
+
+    async def get_or_fetch(self, org_id):
+        record = self.get(org_id)
+        if record is None:
+            await self.warm([org_id])
+            record = self.get(org_id)
+        return record
+
+    def missing(self, org_ids):
+        return sorted({str(i) for i in org_ids if i and not self._is_fresh(self._orgs.get(str(i)))})
+
+    async def warm(self, org_ids):
+        """Fetch every org in org_ids that isn't cached yet, in batches."""
+        missing = self.missing(org_ids)
+        if not missing:
+            return 0
+
+        fetched = 0
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            records = await self.fetch_orgs(batch)
+            now = time.time()
+            with self._lock:
+                for org_id, record in records.items():
+                    self._orgs[str(org_id)] = {"record": record, "fetched_at": now}
+                self.version += 1
+            fetched += len(records)
+
+        if fetched:
+            self.save_soon()
+        return fetched
+
+    def warm_async(self, org_ids):
+        """Warm in a background task, skipping IDs another warm is already fetching."""
+        with self._lock:
+            ids = [i for i in self.missing(org_ids) if i not in self._warming]
+            self._warming.update(ids)
+        if not ids:
+            return
+
+        async def run():
+            detach_request()
+            try:
+                await self.warm(ids)
+            except Exception as e:
+                print(f"⚠️ Org warm-up failed: {e}")
+            finally:
+                with self._lock:
+                    self._warming.difference_update(ids)
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def records(self):
+        """(org_id, record) for every cached org, fresh or stale."""
+        with self._lock:
+            return [(org_id, entry["record"]) for org_id, entry in self._orgs.items()]
+
+    def stale_ids(self):
+        return [org_id for org_id, entry in self._orgs.items() if not self._is_fresh(entry)]
+
+    def __len__(self):
+        return len(self._orgs)
@@ -0,0 +1,8 @@
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Static inputs shipped with the repo (label CSVs, zip centroids...)
+DATA_DIR = os.path.join(BASE_DIR, "data")
+# Runtime state (inventory, org directory, insights) is kept out of DATA_DIR
+STATE_DIR = os.getenv("STATE_DIR", os.path.join(BASE_DIR, "state"))
+INSIGHTS_PATH = os.getenv("INSIGHTS_PATH", os.path.join(STATE_DIR, "insights.json"))
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from cache import animal_key
+from metrics import detach_request
+
+
+class Prefetcher:
+    """Background warming of the response cache for what users open next.
+
+    - schedule_page(): fetch the next search page after serving one, at most
+      `max_concurrency` at a time (extra requests are dropped, not queued).
+    - warm_details(): store detail entries for cats whose search records
+      already carry every detail field, at no upstream cost.
+
+    Every prefetched key is tracked until a request uses it (a hit) or it
+    outlives the cache window unused (wasted). At most `max_pending` keys are
+    tracked; the oldest are counted as unused to make room.
+    """
+
+    def __init__(self, cache, max_concurrency=4, max_pending=20000, expire_every=60):
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.expire_every = expire_every
+        self._pending = OrderedDict()  # key -> (kind, prefetched_at), oldest first
+        self._expired_at = time.time()
+        self._tasks = set()
+        self.counters = {
+            "pages_prefetched": 0, "pages_skipped": 0, "page_hits": 0, "wasted_upstream_calls": 0,
+            "details_warmed": 0, "detail_hits": 0, "details_unused": 0, "errors": 0,
+        }
+
+    # ---- producing
+    async def schedule_page(self, key, fetch):
+        """Run `await fetch()` (which must populate the cache) in the background."""
+        _, state = await self.cache.get(key)
+        if state == "fresh" or key in self._pending or len(self._tasks) >= self.max_concurrency:
+            self.counters["pages_skipped"] += 1
+            return
+        self._track(key, "page", time.time())
+
+        async def run():
+            detach_request()
+            try:
+                await fetch()
+                self.counters["pages_prefetched"] += 1
+            except Exception as e:
+                self._pending.pop(key, None)
+                self.counters["errors"] += 1
+                print(f"⚠️ Prefetch failed for {key}: {e}")
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def warm_details(self, records):
+        """records: {animal_id: animals record with the detail fields}."""
+        now = time.time()
+        keys = [animal_key(animal_id) for animal_id in records]
+        states = await self.cache.get_many(keys)
+        for (animal_id, record), key, (_, state) in zip(records.items(), keys, states):
+            if state == "fresh":
+                continue
+            # Same shape as the upstream response get_cat_details caches
+            await self.cache.set(key, {"status": "ok", "foundRows": 1, "data": {str(animal_id): record}})
+            self._track(key, "detail", now)
+            self.counters["details_warmed"] += 1
+
+    # ---- consuming
+    async def mark_used(self, key):
+        """Call before serving `key`; counts a hit if it was prefetched and is still cached."""
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return
+        kind = entry[0]
+        if (await self.cache.get(key))[0] is not None:
+            self.counters["page_hits" if kind == "page" else "detail_hits"] += 1
+        else:
+            self._count_unused(kind)
+
+    def _count_unused(self, kind):
+        self.counters["wasted_upstream_calls" if kind == "page" else "details_unused"] += 1
+
+    def _track(self, key, kind, now):
+        if key not in self._pending:
+            self._pending[key] = (kind, now)
+        while len(self._pending) > self.max_pending:
+            _, (old_kind, _) = self._pending.popitem(last=False)
+            self._count_unused(old_kind)
+        if now - self._expired_at >= self.expire_every:
+            self._expire()
+
+    def _expire(self):
+        now = time.time()
+        self._expired_at = now
+        horizon = now - (self.cache.ttl + self.cache.stale_ttl)
+        # Insertion order is prefetch order, so expired keys are all at the front
+        while self._pending:
+            key, (kind, prefetched_at) = next(iter(self._pending.items()))
+            if prefetched_at >= horizon:
+                break
+            del self._pending[key]
+            self._count_unused(kind)
+
+    def stats(self):
+        self._expire()
+        c = dict(self.counters)
+        page_total = c["page_hits"] + c["wasted_upstream_calls"]
+        detail_total = c["detail_hits"] + c["details_unused"]
+        c["page_hit_ratio"] = round(c["page_hits"] / page_total, 4) if page_total else 0.0
+        c["detail_hit_ratio"] = round(c["detail_hits"] / detail_total, 4) if detail_total else 0.0
+        c["outstanding"] = len(self._pending)
+        return c
@@ -0,0 +1,94 @@
+import html
+
+from canonical import canonical_breed, canonical_color
+
+# RescueGroups fields requested for search result cards
+SEARCH_FIELDS = [
+    "animalID",
+    "animalName",
+    "animalBreed",
+    "animalColor",
+    "animalSex",
+    "animalLocationCitystate",
+    "animalPictures",
+    "animalDescriptionPlain",
+    "animalAvailableDate",
+    "animalUpdatedDate",
+    "animalOrgID",
+    "animalGeneralAge"
+]
+
+# RescueGroups fields requested for the cat detail page
+DETAIL_FIELDS = [
+    "animalID", "animalName", "animalBreed", "animalColor",
+    "animalSex", "animalAgeString", "animalEnergyLevel",
+    "animalOKWithCats", "animalOKWithDogs", "animalOKWithKids",
+    "animalDescriptionPlain", "animalLocationCitystate",
+    "animalMicrochipped", "animalAltered", "animalSpecialneeds",
+    "animalSpecialneedsDescription", "animalOrgID", "animalOrgName",
+    "animalPictures", "animalUrl"
+]
+
+# Upstream search pages ask for both, so each result can also seed the detail cache
+PAGE_FIELDS = list(dict.fromkeys(SEARCH_FIELDS + DETAIL_FIELDS))
+
+
+def first_image(record):
+    pictures = record.get("animalPictures")
+    if isinstance(pictures, list) and len(pictures) > 0:
+        return pictures[0].get("urlSecureFullsize") or pictures[0].get("urlInsecureFullsize")
+    return None
+
+
+def format_cat(record):
+    """Search result card for one animals record."""
+    return {
+        "id": record.get("animalID"),
+        "name": record.get("animalName"),
+        "breed": canonical_breed(record.get("animalBreed")),
+        "color": canonical_color(record.get("animalColor")),
+        "sex": record.get("animalSex"),
+        "image": first_image(record),
+        "description": html.unescape(record.get("animalDescriptionPlain") or ""),
+        "location": record.get("animalLocationCitystate"),
+        "age": record.get("animalGeneralAge"),
+        "animalAvailableDate": record.get("animalAvailableDate"),
+        "animalUpdatedDate": record.get("animalUpdatedDate")
+    }
+
+
+def format_cat_details(record):
+    """Detail page payload for one animals record, without shelter contact info."""
+    return {
+        "id": record.get("animalID"),
+        "name": record.get("animalName"),
+        "breed": canonical_breed(record.get("animalBreed")),
+        "color": canonical_color(record.get("animalColor")),
+        "sex": record.get("animalSex"),
+        "age": record.get("animalAgeString"),
+        "energy_level": record.get("animalEnergyLevel"),
+        "ok_with_cats": record.get("animalOKWithCats"),
+        "ok_with_dogs": record.get("animalOKWithDogs"),
+        "ok_with_kids": record.get("animalOKWithKids"),
+        "microchipped": record.get("animalMicrochipped"),
+        "altered": record.get("animalAltered"),
+        "special_needs": record.get("animalSpecialneeds"),
+        "special_needs_desc": record.get("animalSpecialneedsDescription"),
+        "description": html.unescape(record.get("animalDescriptionPlain") or ""),
+        "location": record.get("animalLocationCitystate"),
+        "link": record.get("animalUrl"),
+        "image": first_image(record),
+        "shelter": {"name": record.get("animalOrgName", "Unknown Shelter")}
+    }
+
+
+def shelter_info(org_record):
+    """Shelter contact fields from an orgs record."""
+    return {
+        "city": org_record.get("orgLocationCity"),
+        "state": org_record.get("orgLocationState"),
+        "zip": org_record.get("orgLocationPostalcode"),
+        "phone": org_record.get("orgPhone"),
+        "email": org_record.get("orgEmail"),
+        "website": org_record.get("orgUrl")
+    }
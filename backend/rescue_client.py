@@ -0,0 +1,109 @@
+import asyncio
+import os
+import time
+
+import httpx
+
+from metrics import UPSTREAM_ERRORS, UPSTREAM_SECONDS, record_span
+
+
+class UpstreamError(Exception):
+    """RescueGroups answered, but with a non-2xx status or {"status": "error"}."""
+
+
+def is_cacheable(data):
+    return isinstance(data, dict) and data.get("status") != "error"
+
+
+def error_message(data):
+    messages = (data.get("messages") or {}).get("generalMessages") or []
+    return "; ".join(str(m.get("messageText", m)) for m in messages if m) or "no message"
+
+
+class RescueClient:
+    """Async client for the RescueGroups API.
+
+    One pooled httpx client is shared by every request, so connections are
+    kept alive between calls and each call is bounded by a timeout. Identical
+    queries issued while one is already in flight wait for that call instead
+    of starting another (request coalescing), and results go through the
+    shared response cache.
+    """
+
+    def __init__(self, url, cache, timeout=10.0, connect_timeout=3.0,
+                 max_connections=100, max_keepalive=20):
+        self.url = url
+        self.cache = cache
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive)
+        self.counters = {"upstream_calls": 0, "coalesced": 0}
+        self._http = None
+        self._inflight = {}
+
+    async def start(self):
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def post(self, payload):
+        await self.start()
+        self.counters["upstream_calls"] += 1
+        object_type = payload.get("objectType", "unknown")
+        start = time.perf_counter()
+        try:
+            res = await self._http.post(self.url, json=payload)
+            received = time.perf_counter()
+            if not res.is_success:
+                raise UpstreamError(f"{object_type}: HTTP {res.status_code}")
+            data = res.json()
+            # Bad API keys and invalid queries come back as 200 with status "error"
+            if isinstance(data, dict) and data.get("status") == "error":
+                raise UpstreamError(f"{object_type}: {error_message(data)}")
+        except Exception:
+            UPSTREAM_ERRORS.inc(object_type)
+            raise
+        decoded = time.perf_counter()
+
+        UPSTREAM_SECONDS.observe(received - start, object_type, "request")
+        UPSTREAM_SECONDS.observe(decoded - received, object_type, "decode")
+        record_span("upstream", received - start)
+        record_span("decode", decoded - received)
+        return data
+
+    async def fetch(self, payload, key):
+        """POST payload upstream, sharing the call with concurrent identical queries."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.counters["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(self.post(payload))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: one caller going away must not cancel the call for the others
+        return await asyncio.shield(task)
+
+    async def search(self, payload, key):
+        """Cached, coalesced publicSearch."""
+        return await self.cache.get_or_fetch(
+            key, lambda: self.fetch(payload, key), cacheable=is_cacheable
+        )
+
+    def stats(self):
+        return {**self.counters, "in_flight": len(self._inflight)}
+
+
+def client_from_env(url, cache):
+    """Build the shared client from RESCUE_* environment variables."""
+    return RescueClient(
+        url,
+        cache,
+        timeout=float(os.getenv("RESCUE_TIMEOUT", 10)),
+        connect_timeout=float(os.getenv("RESCUE_CONNECT_TIMEOUT", 3)),
+        max_connections=int(os.getenv("RESCUE_MAX_CONNECTIONS", 100)),
+        max_keepalive=int(os.getenv("RESCUE_MAX_KEEPALIVE", 20)),
+    )
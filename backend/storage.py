@@ -0,0 +1,41 @@
+import os
+
+import pandas as pd
+
+# Typed, columnar (Parquet) storage for the adoption datasets.
+# Readers get categoricals and small nullable ints back without re-parsing.
+
+COMBINED_PATH = "combined_adoption_data_cats.parquet"
+COMBINED_CSV_PATH = "combined_adoption_data_cats.csv"
+
+# Set EXPORT_CSV=0 to stop writing the legacy CSV next to the Parquet file
+EXPORT_CSV = os.getenv("EXPORT_CSV", "1") == "1"
+COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+
+CATEGORICAL_COLUMNS = ['Type', 'Breed', 'Color', 'IntakeReason', 'ReturnReason']
+INTEGER_COLUMNS = {'Age': 'Int16', 'Health': 'Int8', 'AdoptionSpeed': 'Int8', 'Adoption_Status': 'Int8'}
+
+def to_storage_dtypes(df):
+    """Cast known columns to categoricals / small nullable ints."""
+    df = df.copy()
+    for col, dtype in INTEGER_COLUMNS.items():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').round().astype(dtype)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+def write_frame(df, path, export_csv=False):
+    """Write df as compressed Parquet (atomically), optionally with a CSV copy."""
+    df = to_storage_dtypes(df)
+    tmp_path = path + ".tmp"
+    df.to_parquet(tmp_path, index=False, compression=COMPRESSION)
+    os.replace(tmp_path, path)
+    if export_csv:
+        df.to_csv(os.path.splitext(path)[0] + ".csv", index=False)
+    return df
+
+def read_frame(path, columns=None):
+    """Read a Parquet frame; the file is memory-mapped rather than copied in."""
+    return pd.read_parquet(path, columns=columns, memory_map=True)
@@ -1,5 +1,4 @@
 import React, { useEffect, useState } from "react";
-import Papa from "papaparse";
 import {
   BarChart,
   Bar,
@@ -11,7 +10,7 @@ import {
 } from "recharts";
 import { motion } from "framer-motion";
 
-const DATA_URL = "http://localhost:5050/data/combined_adoption_data_cats.csv";
+const INSIGHTS_URL = "http://localhost:5050/api/insights";
 const AdoptionSpeedLegend = () => (
   <div>
     <p
@@ -45,21 +44,16 @@ const AdoptionSpeedLegend = () => (
 );
 
 export default function Insights() {
-  const [cats, setCats] = useState([]);
+  const [insights, setInsights] = useState(null);
   const [loading, setLoading] = useState(true);
 
+  // Aggregates are precomputed by the backend during the data refresh
   useEffect(() => {
-    Papa.parse(DATA_URL, {
-      download: true,
-      header: true,
-      complete: (results) => {
-        const cleaned = results.data.filter(
-          (c) => c && Object.keys(c).length > 0 && c.Type?.toLowerCase() === "cat"
-        );
-        setCats(cleaned);
-        setLoading(false);
-      },
-    });
+    fetch(INSIGHTS_URL)
+      .then((res) => res.json())
+      .then((data) => setInsights(data))
+      .catch((err) => console.error("Error fetching insights:", err))
+      .finally(() => setLoading(false));
   }, []);
 
   if (loading)
@@ -69,74 +63,13 @@ export default function Insights() {
       </div>
     );
 
-  // Adoption Speed
-  const adoptionSpeedData = Object.entries(
-    cats.reduce((acc, c) => {
-      const speed = c.AdoptionSpeed?.trim();
-      if (speed && speed.toLowerCase() !== "unknown" && speed !== "") {
-        acc[speed] = (acc[speed] || 0) + 1;
-      }
-      return acc;
-    }, {})
-  )
-    .map(([AdoptionSpeed, Count]) => ({ AdoptionSpeed, Count }))
-    .sort((a, b) => a.AdoptionSpeed - b.AdoptionSpeed);
-
-  // Intake Reasons
-  const intakeReasonData = Object.entries(
-    cats.reduce((acc, c) => {
-      const reason = c.IntakeReason?.trim();
-      if (reason && reason.toLowerCase() !== "unknown" && reason !== "") {
-        acc[reason] = (acc[reason] || 0) + 1;
-      }
-      return acc;
-    }, {})
-  )
-    .map(([IntakeReason, Count]) => ({ IntakeReason, Count }))
-    .sort((a, b) => b.Count - a.Count)
-    .slice(0, 10);
-
-  // Age Group
-  const ageGroupData = Object.entries(
-    cats.reduce((acc, c) => {
-      const age = Number(c.Age || 0);
-      let group = "Unknown";
-      if (age < 6) group = "Kitten (0–6 mo)";
-      else if (age < 24) group = "Young (6–24 mo)";
-      else if (age < 72) group = "Adult (2–6 yr)";
-      else group = "Senior (6+ yr)";
-      acc[group] = (acc[group] || 0) + (Number(c.Adoption_Status?.trim()) === 1 ? 1 : 0);
-      return acc;
-    }, {})
-  ).map(([AgeGroup, Adopted]) => ({ AgeGroup, Adopted }));
-
-  // Breed Trends
-  const breedTrendData = Object.entries(
-    cats.reduce((acc, c) => {
-      const breed = c.Breed?.trim();
-      if (breed && breed.toLowerCase() !== "unknown" && breed !== "") {
-        acc[breed] = (acc[breed] || 0) + 1;
-      }
-      return acc;
-    }, {})
-  )
-    .map(([Breed, Count]) => ({ Breed, Count }))
-    .sort((a, b) => b.Count - a.Count)
-    .slice(0, 10);
-
-  // Color Trends
-  const colorTrendData = Object.entries(
-    cats.reduce((acc, c) => {
-      const color = c.Color?.trim();
-      if (color && color.toLowerCase() !== "unknown" && color !== "") {
-        acc[color] = (acc[color] || 0) + 1;
-      }
-      return acc;
-    }, {})
-  )
-    .map(([Color, Count]) => ({ Color, Count }))
-    .sort((a, b) => b.Count - a.Count)
-    .slice(0, 10);
+  const {
+    adoption_speed: adoptionSpeedData = [],
+    intake_reasons: intakeReasonData = [],
+    age_groups: ageGroupData = [],
+    breeds: breedTrendData = [],
+    colors: colorTrendData = [],
+  } = insights || {};
 
   const lilac = "#d4b1f2";
 